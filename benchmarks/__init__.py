@@ -0,0 +1 @@
+"""Offline benchmarks for the Astral Pool Halo Chlorinator integration."""
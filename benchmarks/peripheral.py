@@ -0,0 +1,373 @@
+"""In-process fake of a Halo chlorinator GATT peripheral.
+
+The fake speaks the same encrypted frame protocol as the real device, so the
+integration's own code (pychlorinator's connect-per-poll gather, the held
+HaloSession and every entity on top) runs unmodified against it. Only the
+Bleak client is swapped out.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import struct
+import time
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from bleak.exc import BleakError
+from pychlorinator.halochlorinator import (
+    UUID_MASTER_AUTHENTICATION_2,
+    UUID_RX_CHARACTERISTIC,
+    UUID_SLAVE_SESSION_KEY_2,
+    UUID_TX_CHARACTERISTIC,
+    decrypt_characteristic,
+    encrypt_characteristic,
+)
+
+CATCH_ALL = 5
+ACTION_CHLORINATOR = 500
+ACTION_LIGHT = 501
+ACTION_HEATER = 502
+ACTION_SOLAR = 503
+
+
+def scan_response(access_code: bytes = b"\x00\x00\x00\x00", status: int = 0) -> bytes:
+    """Build manufacturer data 1095 as advertised by a Halo."""
+    return struct.pack(
+        "<BBBBBBI4sBBBBBBB",
+        1,
+        1,
+        2,
+        0,
+        status,
+        0,
+        0x1234,
+        access_code,
+        2,
+        3,
+        1,
+        0,
+        1,
+        0,
+        0,
+    )
+
+
+class FakeHaloPeripheral:
+    """Simulated chlorinator holding state and streaming frames."""
+
+    def __init__(
+        self,
+        address: str,
+        *,
+        latency: float = 0.02,
+        connect_latency: float = 0.5,
+        loss: float = 0.0,
+        drop_delay: float = 2.0,
+        notify_interval: float | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialise the peripheral.
+
+        latency is the delay per GATT operation and notified frame,
+        connect_latency the cost of connect plus service discovery, loss the
+        probability that a connect fails or a notified frame is dropped.
+        drop_delay is how long the device waits after a catch-all dump before
+        it drops a link nobody keeps alive; notify_interval makes the device
+        push changes on a held link.
+        """
+        self.address = address
+        self.device = SimpleNamespace(address=address, name="HCHLOR", details=None)
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.loss = loss
+        self.drop_delay = drop_delay
+        self.notify_interval = notify_interval
+        self.rng = rng or random.Random(address)
+        self.connects = 0
+        self.failed_connects = 0
+        self.frames_sent = 0
+        self.writes: list[bytes] = []
+        self.last_change_at: float | None = None
+        self.active_client: FakeBleakClient | None = None
+        self.state = SimpleNamespace(
+            mode=1,
+            pump_speed=1,
+            pump_on=True,
+            cell_on=True,
+            ph=72,
+            orp=650,
+            cell_current=4500,
+            cell_level=5,
+            water_temp=265,
+            left_filter=42000,
+            dosing_ml=0,
+            filter_mins=0,
+            heater_mode=0,
+            solar_mode=1,
+            light_modes=[1, 0, 0, 0],
+            num_zones=3,
+        )
+
+    def client(self, *args: Any, **kwargs: Any) -> FakeBleakClient:
+        """Return a client bound to this peripheral."""
+        return FakeBleakClient(self, kwargs.get("disconnected_callback"))
+
+    def drift(self) -> set[int]:
+        """Advance the simulated pool a little; return the frames that changed."""
+        state = self.state
+        changed = {104}
+        state.orp = max(400, min(900, state.orp + self.rng.randint(-5, 5)))
+        if self.rng.random() < 0.2:
+            state.ph = max(68, min(80, state.ph + self.rng.choice((-1, 1))))
+        if state.pump_on:
+            state.left_filter = max(0, state.left_filter - self.rng.randint(50, 150))
+            state.filter_mins += 1
+            changed |= {101, 601}
+        if self.rng.random() < 0.1:
+            state.water_temp += self.rng.choice((-1, 1))
+            changed.add(9)
+        return changed
+
+    def frame(self, cmd_type: int) -> bytes | None:
+        """Return the 17 byte payload of a characteristic, if simulated."""
+        state = self.state
+        flags = 2 if state.cell_on else 0
+        payloads = {
+            1: struct.pack("<BBBBBBBBBI", 1, 1, 2, 0, 2, 3, 1, 0, 1, 123456),
+            9: struct.pack(
+                "<BBHHHHBHHB", 0, 0, 300, state.water_temp, 265, 280, 1, 350, 0, 0
+            ),
+            101: struct.pack("<BIHIHB", 0, 50000, 0, state.left_filter, 0, 1),
+            102: struct.pack("<BHBBB", 72, 650, 0, 0, 0),
+            104: struct.pack(
+                "<BBHBBHBBB2sHB",
+                flags,
+                state.cell_level,
+                state.cell_current if state.cell_on else 0,
+                1,
+                3,
+                state.orp,
+                0,
+                state.ph,
+                0,
+                b"\x00\x00",
+                0,
+                0,
+            ),
+            105: struct.pack("<BB", 2, 2),
+            201: struct.pack(
+                "<BBBBBBBBBBBBHH",
+                1,
+                state.mode,
+                0,
+                0,
+                0,
+                0,
+                0,
+                0,
+                0,
+                0,
+                0,
+                0,
+                1 if state.pump_on else 0,
+                1,
+            ),
+            202: struct.pack("BBBBBBBBBBB", state.pump_speed, *([0] * 10)),
+            300: struct.pack("<4s4sB", bytes(state.light_modes), bytes(4), 0),
+            301: struct.pack("<5B", 1, 1, 0, state.num_zones, 0),
+            601: struct.pack(
+                "<HIIBHH", 12, 3400, 10, 63, state.dosing_ml, state.filter_mins
+            ),
+            1100: struct.pack("<BBBBB", 1, 0, 0, 1, 0),
+            1102: struct.pack(
+                "<BBBBBBBBBHB",
+                1 if state.heater_mode else 0,
+                0,
+                state.heater_mode,
+                28,
+                1,
+                0,
+                0,
+                0,
+                1,
+                270,
+                0,
+            ),
+            1200: struct.pack("<B", 1),
+            1202: struct.pack(
+                "<HHHBBBBBHB", 350, 280, 0, 1, state.solar_mode, 0, 1, 1, 0, 0
+            ),
+        }
+        return payloads.get(cmd_type)
+
+    def all_frames(self) -> list[int]:
+        """Return every simulated characteristic, in catch-all order."""
+        return [
+            1,
+            9,
+            101,
+            102,
+            104,
+            105,
+            201,
+            202,
+            300,
+            301,
+            601,
+            1100,
+            1102,
+            1200,
+            1202,
+        ]
+
+    def apply_action(self, cmd_type: int, action: int, zone: int) -> set[int]:
+        """Apply an app action; return the frames that changed."""
+        state = self.state
+        self.last_change_at = time.monotonic()
+        if cmd_type == ACTION_CHLORINATOR:
+            if action in (1, 2):
+                state.mode = action - 1
+            elif action in (4, 5, 6):
+                state.mode, state.pump_speed = 2, action - 4
+            state.pump_on = state.cell_on = state.mode != 0
+            return {104, 201, 202}
+        if cmd_type == ACTION_HEATER and action in (4, 5):
+            state.heater_mode = action - 4
+            return {1102}
+        if cmd_type == ACTION_SOLAR and action in (1, 2, 3):
+            state.solar_mode = action - 1
+            return {1202}
+        if cmd_type == ACTION_LIGHT and action in (2, 3, 4):
+            state.light_modes[zone] = {2: 1, 3: 0, 4: 2}[action]
+            return {300}
+        return set()
+
+
+class FakeBleakClient:
+    """Bleak client replacement talking to a FakeHaloPeripheral."""
+
+    def __init__(
+        self,
+        peripheral: FakeHaloPeripheral,
+        disconnected_callback: Callable[[FakeBleakClient], None] | None = None,
+    ) -> None:
+        """Initialise the client."""
+        self.peripheral = peripheral
+        self._disconnected_callback = disconnected_callback
+        self._connected = False
+        self._session_key = b""
+        self._notify: Callable[[Any, bytearray], Any] | None = None
+        self._tasks: set[asyncio.Task] = set()
+        # Clients opened by establish_connection belong to a held session;
+        # pychlorinator's own clients are dropped by the device after a dump.
+        self.hold = disconnected_callback is not None
+
+    @property
+    def is_connected(self) -> bool:
+        """Return the link state."""
+        return self._connected
+
+    async def connect(self) -> None:
+        """Connect, failing with the peripheral's loss probability."""
+        peripheral = self.peripheral
+        await asyncio.sleep(peripheral.connect_latency)
+        if peripheral.rng.random() < peripheral.loss:
+            peripheral.failed_connects += 1
+            raise BleakError("Simulated connection failure")
+        if peripheral.active_client is not None:
+            # A Halo only accepts one central at a time
+            peripheral.failed_connects += 1
+            raise BleakError("Simulated device busy")
+        peripheral.connects += 1
+        peripheral.active_client = self
+        self._connected = True
+        if self.hold and peripheral.notify_interval:
+            self._spawn(self._push_loop())
+
+    async def disconnect(self) -> None:
+        """Drop the link."""
+        if not self._connected:
+            return
+        self._connected = False
+        self.peripheral.active_client = None
+        for task in self._tasks:
+            task.cancel()
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
+
+    async def __aenter__(self) -> FakeBleakClient:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.disconnect()
+
+    async def read_gatt_char(self, uuid: str) -> bytearray:
+        """Serve the session key characteristic."""
+        await asyncio.sleep(self.peripheral.latency)
+        assert uuid == UUID_SLAVE_SESSION_KEY_2
+        self._session_key = os.urandom(16)
+        return bytearray(self._session_key)
+
+    async def write_gatt_char(self, uuid: str, data: bytes, *args: Any) -> None:
+        """Accept authentication, read requests and actions."""
+        if not self._connected:
+            raise BleakError("Not connected")
+        await asyncio.sleep(self.peripheral.latency)
+        if uuid == UUID_MASTER_AUTHENTICATION_2:
+            return
+        assert uuid == UUID_RX_CHARACTERISTIC
+        plain = decrypt_characteristic(bytes(data), self._session_key)
+        self.peripheral.writes.append(plain)
+        cmd_type = int.from_bytes(plain[1:3], byteorder="little")
+        if plain[0] == 2:
+            frames = (
+                self.peripheral.all_frames() if cmd_type == CATCH_ALL else [cmd_type]
+            )
+            self._spawn(self._stream(frames, drop_after=cmd_type == CATCH_ALL))
+        elif plain[0] == 3:
+            changed = self.peripheral.apply_action(cmd_type, plain[3], plain[4])
+            self._spawn(self._stream(sorted(changed)))
+
+    async def start_notify(self, uuid: str, callback: Callable) -> None:
+        """Register the notification callback."""
+        assert uuid == UUID_TX_CHARACTERISTIC
+        self._notify = callback
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _stream(self, frames: list[int], drop_after: bool = False) -> None:
+        peripheral = self.peripheral
+        for cmd_type in frames:
+            await asyncio.sleep(peripheral.latency)
+            if not self._connected:
+                return
+            payload = peripheral.frame(cmd_type)
+            if payload is None or self._notify is None:
+                continue
+            if peripheral.rng.random() < peripheral.loss:
+                continue
+            plain = bytes([1]) + cmd_type.to_bytes(2, "little") + payload
+            plain = plain.ljust(20, b"\x00")
+            peripheral.frames_sent += 1
+            result = self._notify(
+                None, bytearray(encrypt_characteristic(plain, self._session_key))
+            )
+            if asyncio.iscoroutine(result):
+                # Bleak schedules coroutine callbacks, pychlorinator uses one
+                self._spawn(result)
+        if drop_after and not self.hold:
+            await asyncio.sleep(peripheral.drop_delay)
+            await self.disconnect()
+
+    async def _push_loop(self) -> None:
+        while self._connected:
+            await asyncio.sleep(self.peripheral.notify_interval)
+            changed = self.peripheral.drift()
+            self.peripheral.last_change_at = time.monotonic()
+            await self._stream(sorted(changed))
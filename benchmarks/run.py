@@ -0,0 +1,403 @@
+"""Benchmark the integration against simulated Halo chlorinators.
+
+Usage (from the repository root, with Home Assistant installed)::
+
+    python -m benchmarks.run --devices 3 --cycles 20 --mode session
+
+Reports refresh latency percentiles, state writes per cycle, BLE connects,
+event loop blocking and memory per device. No hardware is needed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import ExitStack
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry
+from homeassistant.helpers.entity import Entity
+
+from custom_components.astralpool_halo_chlorinator import (
+    async_setup_entry,
+    binary_sensor,
+    config_flow,
+    select,
+    sensor,
+)
+from custom_components.astralpool_halo_chlorinator.const import (
+    CONF_KEEP_CONNECTED,
+    CONF_PUSH_UPDATES,
+    DOMAIN,
+)
+
+from .peripheral import FakeHaloPeripheral, scan_response
+
+PLATFORM_MODULES = {"sensor": sensor, "binary_sensor": binary_sensor, "select": select}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the pct percentile of values (nearest rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class LoopMonitor:
+    """Measure how long the event loop is blocked between short sleeps."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """Initialise the monitor."""
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - start - self.interval))
+
+
+class StateWriteCounter:
+    """Count entity state writes, computing the state like HA would."""
+
+    def __init__(self) -> None:
+        """Initialise the counter."""
+        self.writes = 0
+        self.errors = 0
+
+    def __call__(self, entity: Entity) -> None:
+        """Replace Entity.async_write_ha_state."""
+        self.writes += 1
+        try:
+            entity.state  # noqa: B018
+            entity.extra_state_attributes  # noqa: B018
+        except Exception:  # pylint: disable=broad-except
+            self.errors += 1
+
+
+async def setup_device(
+    hass: HomeAssistant,
+    peripheral: FakeHaloPeripheral,
+    options: dict[str, Any],
+    entry_id: str | None = None,
+) -> tuple[config_entries.ConfigEntry, list[Entity]]:
+    """Run the integration's real setup path against a fake peripheral."""
+    entry = config_entries.ConfigEntry(
+        entry_id=entry_id,
+        version=config_flow.ConfigFlow.VERSION,
+        minor_version=1,
+        domain=DOMAIN,
+        title="HCHLOR",
+        data={CONF_ADDRESS: peripheral.address, CONF_ACCESS_TOKEN: "1234"},
+        source=config_entries.SOURCE_BLUETOOTH,
+        options=options,
+        unique_id=peripheral.address,
+    )
+    entities: list[Entity] = []
+
+    def add_entities(new_entities, update_before_add: bool = False) -> None:
+        for entity in new_entities:
+            # Home Assistant does not add entities that are disabled by default
+            if not entity.entity_registry_enabled_default:
+                continue
+            entity.hass = hass
+            entity.entity_id = f"bench.{peripheral.address}_{len(entities)}"
+            entities.append(entity)
+            hass.async_create_task(entity.async_added_to_hass())
+
+    async def forward_entry_setups(entry, platforms) -> None:
+        # Home Assistant sets the platforms of an entry up concurrently
+        await asyncio.gather(
+            *(
+                PLATFORM_MODULES[str(platform)].async_setup_entry(
+                    hass, entry, add_entities
+                )
+                for platform in platforms
+            )
+        )
+
+    with patch(
+        "custom_components.astralpool_halo_chlorinator.bluetooth."
+        "async_ble_device_from_address",
+        return_value=peripheral.device,
+    ), patch.object(
+        hass.config_entries, "async_forward_entry_setups", forward_entry_setups
+    ):
+        await async_setup_entry(hass, entry)
+        await hass.async_block_till_done()
+    return entry, entities
+
+
+async def bench_config_flow(
+    hass: HomeAssistant, peripheral: FakeHaloPeripheral
+) -> float:
+    """Time discovery and confirmation of the config flow."""
+    from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+
+    info = BluetoothServiceInfoBleak(
+        name="HCHLOR",
+        address=f"{peripheral.address}-flow",
+        rssi=-60,
+        manufacturer_data={1095: scan_response(b"1234")},
+        service_data={},
+        service_uuids=[],
+        source="bench",
+        device=peripheral.device,
+        advertisement=None,
+        connectable=True,
+        time=time.monotonic(),
+    )
+    flow = config_flow.ConfigFlow()
+    flow.hass = hass
+    flow.handler = DOMAIN
+    flow.flow_id = "bench"
+    flow.context = {"source": config_entries.SOURCE_BLUETOOTH}
+    start = time.perf_counter()
+    await flow.async_step_bluetooth(info)
+    await flow.async_step_halo_bluetooth_confirm({})
+    return time.perf_counter() - start
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run one benchmark scenario and return its report."""
+    options = {
+        CONF_KEEP_CONNECTED: args.mode in ("session", "push"),
+        CONF_PUSH_UPDATES: args.mode == "push",
+    }
+    with tempfile.TemporaryDirectory() as config_dir, ExitStack() as stack:
+        hass = HomeAssistant(config_dir)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await device_registry.async_load(hass)
+        counter = StateWriteCounter()
+
+        def async_write_ha_state(entity: Entity) -> None:
+            counter(entity)
+
+        stack.enter_context(
+            patch.object(Entity, "async_write_ha_state", async_write_ha_state)
+        )
+        peripherals = {
+            f"AA:BB:CC:DD:EE:{index:02X}": FakeHaloPeripheral(
+                f"AA:BB:CC:DD:EE:{index:02X}",
+                latency=args.latency,
+                connect_latency=args.connect_latency,
+                loss=args.loss,
+                drop_delay=args.drop_delay,
+                notify_interval=args.notify_interval if args.mode == "push" else None,
+            )
+            for index in range(args.devices)
+        }
+
+        def client_for(device, *args, **kwargs):
+            return peripherals[device.address].client(*args, **kwargs)
+
+        async def establish_connection(client_class, device, name, **kwargs):
+            client = client_for(device, **kwargs)
+            await client.connect()
+            return client
+
+        stack.enter_context(
+            patch("pychlorinator.halochlorinator.BleakClient", client_for)
+        )
+        stack.enter_context(
+            patch(
+                "custom_components.astralpool_halo_chlorinator.session."
+                "establish_connection",
+                establish_connection,
+            )
+        )
+
+        monitor = LoopMonitor()
+        monitor.start()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        setup_start = time.perf_counter()
+        devices = [
+            await setup_device(hass, peripheral, options)
+            for peripheral in peripherals.values()
+        ]
+        setup_time = (time.perf_counter() - setup_start) / args.devices
+        memory = (tracemalloc.get_traced_memory()[0] - baseline) / args.devices
+        tracemalloc.stop()
+
+        flow_time = await bench_config_flow(hass, next(iter(peripherals.values())))
+
+        coordinators = [
+            hass.data[DOMAIN][entry.entry_id].coordinator for entry, _ in devices
+        ]
+        writes_before = counter.writes
+        connects_before = sum(p.connects for p in peripherals.values())
+        frames_before = sum(p.frames_sent for p in peripherals.values())
+        latencies: list[float] = []
+        push_latencies: list[float] = []
+
+        if args.mode == "push":
+            for coordinator, peripheral in zip(coordinators, peripherals.values()):
+
+                def on_publish(peripheral=peripheral) -> None:
+                    if peripheral.last_change_at is not None:
+                        push_latencies.append(
+                            time.monotonic() - peripheral.last_change_at
+                        )
+                        peripheral.last_change_at = None
+
+                coordinator.async_add_listener(on_publish)
+            await asyncio.sleep(args.cycles * args.notify_interval)
+        else:
+            for _ in range(args.cycles):
+                for coordinator, peripheral in zip(coordinators, peripherals.values()):
+                    peripheral.drift()
+                    start = time.perf_counter()
+                    await coordinator.async_refresh()
+                    latencies.append(time.perf_counter() - start)
+                await hass.async_block_till_done()
+
+        cycle_writes = counter.writes - writes_before
+        cycle_connects = sum(p.connects for p in peripherals.values()) - connects_before
+        cycle_frames = sum(p.frames_sent for p in peripherals.values()) - frames_before
+        select_latencies: list[float] = []
+        confirm_latencies: list[float] = []
+        for _, entities in devices:
+            mode_select = next(
+                entity
+                for entity in entities
+                if isinstance(entity, select.ChlorinatorSelect)
+                and entity.entity_description is select.CHLORINATOR_MODE_SELECT
+            )
+            for index in range(args.actions):
+                option = ("Low", "High", "Auto")[index % 3]
+                start = time.perf_counter()
+                await mode_select.async_select_option(option)
+                select_latencies.append(time.perf_counter() - start)
+                while mode_select._optimistic_option is not None:
+                    await asyncio.sleep(0.01)
+                confirm_latencies.append(time.perf_counter() - start)
+            await hass.async_block_till_done()
+
+        # A scene setting every select at once, with a superseded mode change
+        scene_latencies: list[float] = []
+        scene_connects_before = sum(p.connects for p in peripherals.values())
+        for _, entities in devices:
+            selects = [
+                entity
+                for entity in entities
+                if isinstance(entity, select.ChlorinatorSelect)
+            ]
+            mode_select = next(
+                entity
+                for entity in selects
+                if isinstance(entity, select.ChlorinatorSelect)
+                and entity.entity_description is select.CHLORINATOR_MODE_SELECT
+            )
+            calls = [mode_select.async_select_option("Low")]
+            calls += [
+                entity.async_select_option("On")
+                for entity in selects
+                if entity is not mode_select
+            ]
+            calls.append(mode_select.async_select_option("High"))
+            start = time.perf_counter()
+            await asyncio.gather(*calls)
+            while any(entity._optimistic_option is not None for entity in selects):
+                await asyncio.sleep(0.01)
+            scene_latencies.append(time.perf_counter() - start)
+            await hass.async_block_till_done()
+        scene_connects = (
+            sum(p.connects for p in peripherals.values()) - scene_connects_before
+        )
+
+        # Restart: unload, then set up again from the stored snapshot
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+            await coordinator.store.async_flush()
+        restart_start = time.perf_counter()
+        restarted = [
+            await setup_device(hass, peripheral, options, entry.entry_id)
+            for (entry, _), peripheral in zip(devices, peripherals.values())
+        ]
+        restart_time = (time.perf_counter() - restart_start) / args.devices
+        coordinators = [
+            hass.data[DOMAIN][entry.entry_id].coordinator for entry, _ in restarted
+        ]
+        await hass.async_block_till_done()
+
+        monitor.stop()
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    cycles = args.cycles * args.devices
+    return {
+        "mode": args.mode,
+        "devices": args.devices,
+        "cycles": args.cycles,
+        "setup_s_per_device": round(setup_time, 4),
+        "restart_setup_s_per_device": round(restart_time, 4),
+        "config_flow_s": round(flow_time, 4),
+        "refresh_p50_s": round(percentile(latencies, 50), 4),
+        "refresh_p95_s": round(percentile(latencies, 95), 4),
+        "refresh_p99_s": round(percentile(latencies, 99), 4),
+        "push_p50_s": round(percentile(push_latencies, 50), 4),
+        "push_p95_s": round(percentile(push_latencies, 95), 4),
+        "select_p50_s": round(percentile(select_latencies, 50), 4),
+        "select_confirm_p50_s": round(percentile(confirm_latencies, 50), 4),
+        "scene_confirm_s": round(statistics.fmean(scene_latencies), 4),
+        "scene_ble_connects": round(scene_connects / args.devices, 2),
+        "state_writes_per_cycle": round(cycle_writes / cycles, 2),
+        "state_errors": counter.errors,
+        "ble_connects_per_cycle": round(cycle_connects / cycles, 2),
+        "frames_per_cycle": round(cycle_frames / cycles, 2),
+        "loop_block_max_ms": round(max(monitor.lags, default=0) * 1000, 2),
+        "loop_block_p99_ms": round(percentile(monitor.lags, 99) * 1000, 2),
+        "loop_block_mean_ms": round(
+            statistics.fmean(monitor.lags) * 1000 if monitor.lags else 0, 3
+        ),
+        "memory_kib_per_device": round(memory / 1024, 1),
+    }
+
+
+def main() -> None:
+    """Parse arguments and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--mode", choices=("poll", "session", "push"), default="poll")
+    parser.add_argument("--actions", type=int, default=3, help="mode changes")
+    parser.add_argument("--latency", type=float, default=0.02, help="per GATT op (s)")
+    parser.add_argument("--connect-latency", type=float, default=0.5, help="s")
+    parser.add_argument("--loss", type=float, default=0.0, help="0..1")
+    parser.add_argument("--drop-delay", type=float, default=2.0, help="s")
+    parser.add_argument("--notify-interval", type=float, default=1.0, help="s")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args()
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for key, value in report.items():
+        print(f"{key:<26} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,48 +12,162 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ACCESS_TOKEN, CONF_ADDRESS, Platform
 from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .advertisement import AdvertisementMonitor
+from .const import (
+    CONF_IDLE_TIMEOUT,
+    CONF_KEEP_CONNECTED,
+    CONF_PUSH_UPDATES,
+    CONF_STALE_AFTER,
+    CONF_TREND_WINDOW,
+    DATA_SCHEDULER,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_KEEP_CONNECTED,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_STALE_AFTER,
+    DEFAULT_TREND_WINDOW,
+    DOMAIN,
+)
 from .coordinator import ChlorinatorDataUpdateCoordinator
 from .models import ChlorinatorData
+from .scheduler import BluetoothScheduler
+from .services import async_setup_services
+from .session import HaloSession
+from .storage import SECTION_SNAPSHOT, ChlorinatorStore
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.SELECT]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 _LOGGER = logging.getLogger(__name__)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services shared by all chlorinators."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Chlorinator from a config entry."""
 
     address: str = entry.data[CONF_ADDRESS]
     accesscode: str = entry.data[CONF_ACCESS_TOKEN]
+    store = ChlorinatorStore(hass, entry.entry_id)
+    await store.async_load()
     ble_device = bluetooth.async_ble_device_from_address(
         hass, address.upper(), True
     ) or await get_device(address)
-    if not ble_device:
+    # A Halo with a stored snapshot can come up before it is in range again
+    name = ble_device.name if ble_device else entry.title
+    if not ble_device and not (name == "HCHLOR" and store.get(SECTION_SNAPSHOT)):
         raise ConfigEntryNotReady(
             f"Could not find chlorinator device with address {address}"
         )
 
     _LOGGER.debug("async_setup_entry address:  %s accesscode %s", address, accesscode)
-    if ble_device.name == "HCHLOR":
+    session = None
+    push = entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES)
+    keep_connected = push or entry.options.get(
+        CONF_KEEP_CONNECTED, DEFAULT_KEEP_CONNECTED
+    )
+    if name == "HCHLOR":
         # true
         chlorinator = HaloChlorinatorAPI(ble_device, accesscode)
+        # Also used for batched writes when the link is not kept open
+        session = HaloSession(
+            hass,
+            address,
+            ble_device,
+            accesscode,
+            entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+        )
     else:
         chlorinator = ChlorinatorAPI(ble_device, accesscode)
 
-    coordinator = ChlorinatorDataUpdateCoordinator(hass, chlorinator)
-    await coordinator.async_config_entry_first_refresh()
+    scheduler = hass.data.setdefault(DATA_SCHEDULER, BluetoothScheduler())
+    coordinator = ChlorinatorDataUpdateCoordinator(
+        hass,
+        chlorinator,
+        address,
+        scheduler,
+        session,
+        keep_connected,
+        push,
+        store,
+        entry.options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER),
+        entry.options.get(CONF_TREND_WINDOW, DEFAULT_TREND_WINDOW),
+    )
+    if coordinator.async_restore():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} {address} refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = ChlorinatorData(
         entry.title, chlorinator, coordinator
     )
 
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    if coordinator.push:
+        entry.async_on_unload(coordinator.async_start_watchdog())
+
+    if "bluetooth" in hass.config.components:
+        entry.async_on_unload(AdvertisementMonitor(hass, coordinator).async_start())
+
+    if "recorder" in hass.config.components:
+        # pylint: disable-next=import-outside-toplevel
+        from .statistics import StatisticsImporter
+
+        importer = StatisticsImporter(hass, coordinator)
+        entry.async_on_unload(coordinator.async_add_listener(importer.async_update))
+        entry.async_on_unload(importer.async_import)
+        importer.async_update()
+
     hass.async_create_task(
         hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     )
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate a single-device entry to per-address identities."""
+    if entry.version == 1:
+        address: str = entry.data[CONF_ADDRESS]
+
+        @callback
+        def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict | None:
+            if not entity_entry.unique_id.lower().startswith("hchlor_"):
+                return None
+            return {"new_unique_id": f"{address}_{entity_entry.unique_id[7:]}".lower()}
+
+        await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
+
+        device_registry = dr.async_get(hass)
+        if (
+            device := device_registry.async_get_device(identifiers={(DOMAIN, "HCHLOR")})
+        ) and entry.entry_id in device.config_entries:
+            device_registry.async_update_device(
+                device.id, new_identifiers={(DOMAIN, address)}
+            )
+
+        hass.config_entries.async_update_entry(entry, version=2)
+        _LOGGER.debug("Migrated %s to version 2", address)
+
+    return True
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = True
@@ -61,4 +175,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if not await hass.config_entries.async_forward_entry_unload(entry, platform):
             unload_ok = False
 
+    if unload_ok:
+        data: ChlorinatorData = hass.data[DOMAIN].pop(entry.entry_id)
+        await data.coordinator.async_shutdown()
+        if data.coordinator.store is not None:
+            await data.coordinator.store.async_flush()
+
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored snapshot of a removed entry."""
+    await ChlorinatorStore(hass, entry.entry_id).async_remove()
@@ -0,0 +1,89 @@
+"""Follow a Halo's advertisements without connecting to it."""
+from __future__ import annotations
+
+import logging
+import struct
+from typing import Any
+
+from pychlorinator.halo_parsers import ScanResponse
+
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import MANUFACTURER_ID
+from .coordinator import ChlorinatorDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# ScanResponse fields published as data; TimeAlive ticks too often to be useful
+ADVERTISED_KEYS = ("DeviceStatus", "FirmwareMajorVersion", "FirmwareMinorVersion")
+
+
+def decode_advertisement(manufacturer_data: bytes) -> dict[str, Any] | None:
+    """Return the advertised values, or None if the payload is not a Halo's."""
+    try:
+        scan = ScanResponse(manufacturer_data)
+    except (struct.error, ValueError) as err:
+        _LOGGER.debug("Undecodable advertisement %s: %s", manufacturer_data, err)
+        return None
+    return {key: getattr(scan, key) for key in ADVERTISED_KEYS}
+
+
+class AdvertisementMonitor:
+    """Feed advertisements and presence to the coordinator.
+
+    The Halo's advertisement only carries its status byte and firmware, not
+    mode, pump or cell state, so it cannot replace the polls. It is used to
+    poll right away when the status byte changes or the Halo comes back in
+    range, and to skip polls while it is out of range.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: ChlorinatorDataUpdateCoordinator
+    ) -> None:
+        """Initialise the monitor."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start listening; return a callback that stops it."""
+        address = self.coordinator.address.upper()
+        unsubs = [
+            bluetooth.async_register_callback(
+                self.hass,
+                self._async_advertisement,
+                bluetooth.BluetoothCallbackMatcher(address=address),
+                bluetooth.BluetoothScanningMode.PASSIVE,
+            ),
+            bluetooth.async_track_unavailable(
+                self.hass, self._async_unavailable, address, connectable=True
+            ),
+        ]
+        if service_info := bluetooth.async_last_service_info(self.hass, address):
+            self._async_advertisement(service_info, None)
+
+        @callback
+        def stop() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return stop
+
+    @callback
+    def _async_advertisement(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange | None,
+    ) -> None:
+        self.coordinator.metrics.rssi = service_info.rssi
+        if (data := service_info.manufacturer_data.get(MANUFACTURER_ID)) is None:
+            return
+        if (advertised := decode_advertisement(data)) is not None:
+            self.coordinator.async_set_advertisement(advertised)
+
+    @callback
+    def _async_unavailable(
+        self, service_info: bluetooth.BluetoothServiceInfoBleak
+    ) -> None:
+        self.coordinator.async_set_absent()
@@ -0,0 +1,152 @@
+"""Rolling pH and ORP trends derived from the chlorinator's readings."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+import math
+from typing import Any, NamedTuple
+
+from .const import ANALYTICS_MAX_SAMPLES, ORP_BAND, PH_BAND
+from .derived import DerivedValues
+
+# (reading, setpoint, band either side of the setpoint, derived key prefix)
+CHEMISTRY = (
+    ("ph_measurement", "ph_control_setpoint", PH_BAND, "ph"),
+    ("ORPMeasurement", "chlorine_control_setpoint", ORP_BAND, "orp"),
+)
+
+
+class Sample(NamedTuple):
+    """One reading in a rolling window."""
+
+    time: float
+    value: float
+    out_of_band: float
+
+
+class RollingWindow:
+    """Running sums over the samples of the last window seconds.
+
+    Adding and expiring a sample only adjusts the sums, so mean, variance
+    and the least squares slope cost O(1) per sample. Times are kept
+    relative to an origin that moves along with the window to keep the
+    squared sums well conditioned.
+    """
+
+    def __init__(self, window: float, capacity: int = ANALYTICS_MAX_SAMPLES) -> None:
+        """Initialise an empty window."""
+        self.window = window
+        self._samples: deque[Sample] = deque()
+        self._capacity = capacity
+        self._origin = 0.0
+        self._reset_sums()
+
+    def _reset_sums(self) -> None:
+        self._n = 0
+        self._t = self._tt = self._x = self._xx = self._tx = 0.0
+        self.out_of_band = 0.0
+
+    def _apply(self, sample: Sample, sign: int) -> None:
+        t = sample.time - self._origin
+        x = sample.value
+        self._n += sign
+        self._t += sign * t
+        self._tt += sign * t * t
+        self._x += sign * x
+        self._xx += sign * x * x
+        self._tx += sign * t * x
+        self.out_of_band += sign * sample.out_of_band
+
+    def add(self, time: float, value: float, out_of_band: float = 0.0) -> None:
+        """Add a reading taken at time (seconds); out_of_band is time it adds."""
+        while self._samples and (
+            self._samples[0].time <= time - self.window
+            or len(self._samples) >= self._capacity
+        ):
+            self._apply(self._samples.popleft(), -1)
+        if not self._samples or time - self._origin > 4 * self.window:
+            # Move the origin and rebuild the sums from what is left
+            self._origin = self._samples[0].time if self._samples else time
+            self._reset_sums()
+            for sample in self._samples:
+                self._apply(sample, 1)
+        sample = Sample(time, value, out_of_band)
+        self._samples.append(sample)
+        self._apply(sample, 1)
+
+    @property
+    def last(self) -> Sample | None:
+        """Return the newest sample."""
+        return self._samples[-1] if self._samples else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the window."""
+        return self._x / self._n if self._n else None
+
+    @property
+    def stddev(self) -> float | None:
+        """Return the standard deviation of the window."""
+        if not self._n:
+            return None
+        return math.sqrt(max(self._xx / self._n - (self._x / self._n) ** 2, 0.0))
+
+    @property
+    def slope(self) -> float | None:
+        """Return the least squares slope in value per second."""
+        denominator = self._n * self._tt - self._t * self._t
+        if self._n < 2 or denominator <= 0:
+            return None
+        return (self._n * self._tx - self._t * self._x) / denominator
+
+
+class ChemistryTrend(DerivedValues):
+    """Feed fresh readings of one measurement into a rolling window.
+
+    Derived values (e.g. ph_drift, orp_deviation, ph_out_of_band) are
+    returned as data keys named after prefix. The window is not stored, so
+    trends start over after a restart.
+    """
+
+    def __init__(
+        self, source: str, setpoint_key: str, band: float, prefix: str, window: float
+    ) -> None:
+        """Initialise an empty window for source."""
+        self.source = source
+        self.setpoint_key = setpoint_key
+        self.band = band
+        self.prefix = prefix
+        self.outputs = {
+            f"{prefix}_{stat}": source
+            for stat in ("mean", "stddev", "out_of_band", "drift", "deviation")
+        }
+        self.window = RollingWindow(window)
+        super().__init__()
+
+    def sample(self, read_at: datetime, value: float, data: dict[str, Any]) -> None:
+        """Add the reading, with the time out of band since the one before."""
+        out_of_band = 0.0
+        setpoint = data.get(self.setpoint_key)
+        if (
+            self.last is not None
+            and isinstance(setpoint, (int, float))
+            and abs(self.last[1] - setpoint) > self.band
+        ):
+            out_of_band = read_at.timestamp() - self.last[0]
+        self.window.add(read_at.timestamp(), value, out_of_band)
+
+    def derive(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return the window's statistics."""
+        window, prefix = self.window, self.prefix
+        if window.mean is None:
+            return {}
+        derived: dict[str, Any] = {
+            f"{prefix}_mean": round(window.mean, 3),
+            f"{prefix}_stddev": round(window.stddev, 3),
+            f"{prefix}_out_of_band": round(window.out_of_band / 60, 1),
+        }
+        if (slope := window.slope) is not None:
+            derived[f"{prefix}_drift"] = round(slope * 3600, 3)
+        if isinstance(setpoint := data.get(self.setpoint_key), (int, float)):
+            derived[f"{prefix}_deviation"] = round(window.mean - setpoint, 3)
+        return derived
@@ -10,12 +10,15 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import ChlorinatorDataUpdateCoordinator
+from .entity import (
+    CapabilityTable,
+    ChlorinatorEntity,
+    async_setup_capability_entities,
+)
 from .models import ChlorinatorData
 
 _LOGGER = logging.getLogger(__name__)
@@ -75,6 +78,19 @@ SOLAR_BINARY_SENSOR_TYPES: dict[str, BinarySensorEntityDescription] = {
 }
 
 
+# Capability -> the entities it brings
+CAPABILITY_BINARY_SENSORS: CapabilityTable = {
+    "SolarEnabled": lambda coordinator: [
+        HeaterBinarySensor(coordinator, desc)
+        for desc in SOLAR_BINARY_SENSOR_TYPES.values()
+    ],
+    "HeaterEnabled": lambda coordinator: [
+        HeaterBinarySensor(coordinator, desc)
+        for desc in HEATER_BINARY_SENSOR_TYPES.values()
+    ],
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: config_entries.ConfigEntry,
@@ -82,38 +98,23 @@ async def async_setup_entry(
 ) -> None:
     """Set up Chlorinator binary sensors from a config entry."""
     data: ChlorinatorData = hass.data[DOMAIN][entry.entry_id]
-    coordinator = data.coordinator
-
-    async def add_binary_sensor_callback(sensor_type):
-        binary_sensor_types_dict = {
-            "SolarEnabled": SOLAR_BINARY_SENSOR_TYPES,
-            "HeaterEnabled": HEATER_BINARY_SENSOR_TYPES,
-        }
-        sensor_descs = binary_sensor_types_dict.get(sensor_type, {})
-
-        new_entities = []
-        for sensor_type, sensor_desc in sensor_descs.items():
-            unique_id = f"hchlor_{sensor_type}".lower()
-            if unique_id not in coordinator.added_entities:
-                new_entities.append(HeaterBinarySensor(coordinator, sensor_desc))
-                coordinator.added_entities.add(unique_id)
-
-        if new_entities:
-            async_add_entities(new_entities)
-
-    coordinator.add_binary_sensor_callback = add_binary_sensor_callback
-    await coordinator.async_config_entry_first_refresh()
-
     entities = [
         ChlorinatorBinarySensor(data.coordinator, sensor_desc)
         for sensor_desc in CHLORINATOR_BINARY_SENSOR_TYPES
     ]
-    async_add_entities(entities)
+    async_setup_capability_entities(
+        data.coordinator,
+        entry,
+        async_add_entities,
+        entities,
+        CAPABILITY_BINARY_SENSORS,
+    )
 
 
-class ChlorinatorBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class ChlorinatorBinarySensor(ChlorinatorEntity, BinarySensorEntity):
     """Representation of a Clorinator binary sensor."""
 
+    _attr_has_entity_name = True
     _attr_name = "Pump is operating"
 
     def __init__(
@@ -124,49 +125,34 @@ class ChlorinatorBinarySensor(CoordinatorEntity, BinarySensorEntity):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._sensor = sensor
-        self._attr_unique_id = f"HCHLOR_{sensor}".lower()
+        self._data_keys = (sensor,)
+        self._attr_unique_id = f"{coordinator.address}_{sensor}".lower()
         self._attr_name = CHLORINATOR_BINARY_SENSOR_TYPES[sensor].name
         self.entity_description = CHLORINATOR_BINARY_SENSOR_TYPES[sensor]
         self._attr_device_class = CHLORINATOR_BINARY_SENSOR_TYPES[sensor].device_class
 
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        return {
-            "identifiers": {(DOMAIN, "HCHLOR")},
-            "name": "HCHLOR",
-            "model": "Halo Chlor",
-            "manufacturer": "Astral Pool",
-        }
-
     @property
     def is_on(self) -> bool:
         """Return the state of the sensor."""
         return self.coordinator.data.get(self._sensor)
 
 
-class HeaterBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class HeaterBinarySensor(ChlorinatorEntity, BinarySensorEntity):
     """Representation of a Clorinator binary sensor."""
 
+    _attr_has_entity_name = True
     _attr_name = "Pump is operating"
 
     def __init__(self, coordinator, sensor_desc: BinarySensorEntityDescription):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._sensor = sensor_desc.key
-        self._attr_unique_id = f"hchlor_{self._sensor}".lower()
+        self._data_keys = (self._sensor,)
+        self._attr_unique_id = f"{coordinator.address}_{self._sensor}".lower()
         self.entity_description = sensor_desc
         self._attr_name = sensor_desc.name
         self._attr_device_class = sensor_desc.device_class
 
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        return {
-            "identifiers": {(DOMAIN, "HCHLOR")},
-            "name": "HCHLOR",
-            "model": "Halo Chlor",
-            "manufacturer": "Astral Pool",
-        }
-
     @property
     def is_on(self) -> bool:
         """Return the state of the sensor."""
@@ -0,0 +1,85 @@
+"""Cell wear: amp-hours, daily running time and projected cell life."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+
+from .const import CELL_DAILY_SMOOTHING, CELL_RATED_HOURS, CELL_SAMPLE_MAX_GAP
+from .derived import DerivedValues
+
+
+class CellWearEstimator(DerivedValues):
+    """Integrate the cell current into running totals that survive restarts.
+
+    Each fresh CellCurrentmA reading closes the interval since the one
+    before, which is counted at the earlier reading's current and running
+    state. Intervals longer than CELL_SAMPLE_MAX_GAP, e.g. while the Halo
+    was out of reach, are not counted. Cell life is projected from the
+    device's own lifetime CellRunningTime against CELL_RATED_HOURS, at the
+    smoothed running time of recent days.
+    """
+
+    source = "CellCurrentmA"
+    outputs = {
+        "cell_amp_hours": "CellCurrentmA",
+        "cell_runtime_today": "CellCurrentmA",
+        "cell_life_used": "CellRunningTime",
+        "cell_life_remaining": "CellRunningTime",
+    }
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        """Pick up the stored totals."""
+        self.amp_hours: float = stored.get("amp_hours", 0.0)
+        self.day: str | None = stored.get("day")
+        self.runtime_today: float = stored.get("runtime_today", 0.0)
+        self.daily_runtime: float | None = stored.get("daily_runtime")
+        self.running: bool = stored.get("running", False)
+
+    def state(self) -> dict[str, Any]:
+        """Return the totals to store."""
+        return {
+            "amp_hours": self.amp_hours,
+            "day": self.day,
+            "runtime_today": self.runtime_today,
+            "daily_runtime": self.daily_runtime,
+            "running": self.running,
+        }
+
+    def sample(self, read_at: datetime, value: float, data: dict[str, Any]) -> None:
+        """Count the interval since the previous current reading."""
+        self._roll_day(read_at.date().isoformat())
+        if self.last is not None:
+            last_time, last_current = self.last
+            if (elapsed := read_at.timestamp() - last_time) <= CELL_SAMPLE_MAX_GAP:
+                self.amp_hours += last_current / 1000 * elapsed / 3600
+                if self.running:
+                    self.runtime_today += elapsed / 3600
+        self.running = bool(data.get("cell_is_operating", value > 0))
+
+    def derive(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return the totals and the projected cell life."""
+        derived: dict[str, Any] = {
+            "cell_amp_hours": round(self.amp_hours, 3),
+            "cell_runtime_today": round(self.runtime_today, 2),
+        }
+        if isinstance(hours := data.get("CellRunningTime"), (int, float)):
+            derived["cell_life_used"] = round(hours / CELL_RATED_HOURS * 100, 1)
+            if self.daily_runtime:
+                remaining = max(CELL_RATED_HOURS - hours, 0)
+                derived["cell_life_remaining"] = round(remaining / self.daily_runtime)
+        return derived
+
+    def _roll_day(self, day: str) -> None:
+        """Fold a finished day's running time into the daily average."""
+        if day == self.day:
+            return
+        if self.day is not None:
+            if self.daily_runtime is None:
+                self.daily_runtime = self.runtime_today
+            else:
+                self.daily_runtime += CELL_DAILY_SMOOTHING * (
+                    self.runtime_today - self.daily_runtime
+                )
+        self.day = day
+        self.runtime_today = 0.0
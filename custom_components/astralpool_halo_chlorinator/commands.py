@@ -0,0 +1,95 @@
+"""Serialised, coalescing queue of app actions for one chlorinator."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import COMMAND_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandQueue:
+    """Collect actions for a short window and hand them over as one batch.
+
+    An action for a target that already has one queued replaces it, so a
+    quick Low then High only writes High. Batches run one after another.
+    The executor calls ``written`` once the batch is on the device, which
+    releases the submitters while it goes on to read back the result;
+    submitters that asked for confirmation are released once that is done.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        execute: Callable[[list[Any], Callable[[], None]], Awaitable[None]],
+    ) -> None:
+        """Initialise the queue."""
+        self.hass = hass
+        self.name = name
+        self._execute = execute
+        self._pending: dict[Hashable, Any] = {}
+        self._waiters: list[tuple[asyncio.Future[None], bool]] = []
+        # Waiters of the batch being written, released by cancel() too
+        self._in_flight: list[tuple[asyncio.Future[None], bool]] = []
+        self._task: asyncio.Task | None = None
+
+    async def async_submit(
+        self, target: Hashable, command: Any, confirmed: bool = False
+    ) -> None:
+        """Queue command for target; return once the batch holding it is written.
+
+        With confirmed, return once the batch has also been read back.
+        """
+        if target in self._pending:
+            _LOGGER.debug(
+                "%s: %s supersedes %s", self.name, command, self._pending[target]
+            )
+            # Written in the order of the latest submissions
+            del self._pending[target]
+        self._pending[target] = command
+        waiter = self.hass.loop.create_future()
+        self._waiters.append((waiter, confirmed))
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"{self.name} commands"
+            )
+        await waiter
+
+    def cancel(self) -> None:
+        """Drop queued commands and stop the worker."""
+        if self._task is not None:
+            self._task.cancel()
+        for waiter, _ in (*self._in_flight, *self._waiters):
+            waiter.cancel()
+        self._pending.clear()
+        self._waiters.clear()
+        self._in_flight = []
+
+    async def _async_run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(COMMAND_WINDOW)
+            batch, self._pending = list(self._pending.values()), {}
+            waiters = self._in_flight = self._waiters
+            self._waiters = []
+            _LOGGER.debug("%s: writing %s", self.name, batch)
+
+            def written(waiters=waiters, confirmed: bool = False) -> None:
+                for waiter, wants_confirmation in waiters:
+                    if not waiter.done() and (confirmed or not wants_confirmation):
+                        waiter.set_result(None)
+
+            try:
+                await self._execute(batch, written)
+            except Exception as err:  # pylint: disable=broad-except
+                for waiter, _ in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(err)
+                _LOGGER.debug("%s: batch failed: %s", self.name, err)
+                continue
+            written(confirmed=True)
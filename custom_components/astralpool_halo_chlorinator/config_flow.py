@@ -17,9 +17,24 @@ from homeassistant.components.bluetooth import (
     async_process_advertisements,
 )
 from homeassistant.const import CONF_ACCESS_TOKEN, CONF_ADDRESS
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, LOCAL_NAMES
+from .const import (
+    CONF_IDLE_TIMEOUT,
+    CONF_KEEP_CONNECTED,
+    CONF_PUSH_UPDATES,
+    CONF_STALE_AFTER,
+    CONF_TREND_WINDOW,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_KEEP_CONNECTED,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_STALE_AFTER,
+    DEFAULT_TREND_WINDOW,
+    DOMAIN,
+    LOCAL_NAMES,
+    MANUFACTURER_ID,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,7 +45,7 @@ WAIT_FOR_PAIRING_TIMEOUT = 20
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Astral Chlorinator."""
 
-    VERSION = 1
+    VERSION = 2
 
     def __init__(self) -> None:
         """Initialize the config flow."""
@@ -39,6 +54,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._pairing_task: asyncio.Task | None = None
         self._bytes_access_code: None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfoBleak
     ) -> FlowResult:
@@ -64,7 +87,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             if getattr(self._discovery_info, "manufacturer_data", None) is not None:
                 # manufacturer_data exists - Appears to be a bleak bug that sometimes doesnt show manufacturer data
-                manufacturer_data = self._discovery_info.manufacturer_data[1095]
+                manufacturer_data = self._discovery_info.manufacturer_data[
+                    MANUFACTURER_ID
+                ]
                 if not ScanResponse(manufacturer_data).isPairable:
                     return await self.async_step_wait_for_pairing_mode()
                 # return self._discovery_info.name
@@ -147,7 +172,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         def is_device_in_pairing_mode(
             service_info: BluetoothServiceInfoBleak,
         ) -> bool:
-            manufacturer_data = service_info.manufacturer_data[1095]
+            manufacturer_data = service_info.manufacturer_data[MANUFACTURER_ID]
             self._bytes_access_code = ScanResponse(manufacturer_data).get_access_code()
             _LOGGER.info("Access Code %s", self._bytes_access_code)
             return ScanResponse(manufacturer_data).isPairable
@@ -219,3 +244,45 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=data_schema,
             errors=errors,
         )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle chlorinator connection options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_KEEP_CONNECTED,
+                    default=options.get(CONF_KEEP_CONNECTED, DEFAULT_KEEP_CONNECTED),
+                ): bool,
+                vol.Required(
+                    CONF_IDLE_TIMEOUT,
+                    default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                vol.Required(
+                    CONF_PUSH_UPDATES,
+                    default=options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES),
+                ): bool,
+                vol.Required(
+                    CONF_STALE_AFTER,
+                    default=options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER),
+                ): vol.All(vol.Coerce(int), vol.Range(min=300, max=86400)),
+                vol.Required(
+                    CONF_TREND_WINDOW,
+                    default=options.get(CONF_TREND_WINDOW, DEFAULT_TREND_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=900, max=86400)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=data_schema)
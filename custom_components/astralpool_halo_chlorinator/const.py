@@ -3,3 +3,67 @@
 DOMAIN = "astralpool_halo_chlorinator"
 
 LOCAL_NAMES = {"HCHLOR"}
+MANUFACTURER_ID = 1095  # key of the ScanResponse in the manufacturer data
+
+CONF_KEEP_CONNECTED = "keep_connected"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_STALE_AFTER = "stale_after"
+CONF_TREND_WINDOW = "trend_window"
+
+DEFAULT_KEEP_CONNECTED = False
+DEFAULT_IDLE_TIMEOUT = 300  # seconds without a poll or write before releasing
+DEFAULT_PUSH_UPDATES = False
+DEFAULT_STALE_AFTER = 3600  # seconds a value may go without a read
+DEFAULT_TREND_WINDOW = 10800  # seconds of pH and ORP readings in the trends
+
+POLL_INTERVAL_FAST = 20  # seconds, after a user action or while switching
+POLL_INTERVAL_ACTIVE = 60  # seconds, while the pump, cell or heater runs
+POLL_INTERVAL_STANDBY = 300  # seconds, in Auto with everything off
+POLL_INTERVAL_IDLE = 900  # seconds, in Off
+USER_ACTION_WINDOW = 120  # seconds to poll fast after a user action
+POLL_RETRY_LIMIT = 8  # failed polls in a row before pausing polls
+RETRY_BACKOFF_MAX = 300  # seconds, cap of the doubling retry interval
+RETRY_JITTER = 0.2  # +/- fraction applied to retry intervals
+CIRCUIT_OPEN_INTERVAL = 1800  # seconds between probes once polls are paused
+SLOW_READ_INTERVAL = 900  # seconds between reads of settings and statistics
+FRESHNESS_REPORT_INTERVAL = 600  # seconds between last_updated-only writes
+
+# Where a value came from
+SOURCE_POLL = "poll"
+SOURCE_NOTIFICATION = "notification"
+SOURCE_ADVERTISEMENT = "advertisement"
+
+PUSH_WATCHDOG_INTERVAL = 300  # seconds between full gathers in push mode
+PUSH_DEBOUNCE = 0.2  # seconds to coalesce a burst of notification frames
+
+KEEPALIVE_INTERVAL = 10  # seconds between keep alive reads on a held session
+GATHER_QUIET_TIME = 1.0  # seconds without a frame that ends a gather
+GATHER_TIMEOUT = 15  # seconds, matches pychlorinator's wait for disconnect
+READ_TIMEOUT = 5  # seconds to wait for the frames of a targeted read
+COMMAND_WINDOW = 0.25  # seconds to collect actions into one batch
+CONFIRM_TIMEOUT = 30  # seconds before an unconfirmed optimistic state rolls back
+RECONNECT_BACKOFF_MIN = 2  # seconds
+RECONNECT_BACKOFF_MAX = 300  # seconds
+
+ANALYTICS_MAX_SAMPLES = 1000  # readings kept per trend window
+PH_BAND = 0.2  # pH either side of the setpoint that counts as in band
+ORP_BAND = 50  # mV either side of the setpoint that counts as in band
+
+CELL_RATED_HOURS = 10000  # typical rated running time of a salt cell
+CELL_SAMPLE_MAX_GAP = 1800  # seconds between current readings still integrated
+CELL_DAILY_SMOOTHING = 0.2  # weight of the latest day in the daily running time
+
+DOSING_RESET_GRACE = 7200  # seconds after midnight the device may not have reset
+DOSING_ROLLUP_DAYS = 7  # days in the weekly acid dosing total
+
+FILTER_FLOW_WINDOW = 900  # seconds of PoolLeftFilter readings the flow is fit to
+FILTER_HISTORY_DAYS = 7  # days of filtration summaries kept
+
+METRICS_WINDOW = 100  # samples kept per timing for the rolling percentiles
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60  # seconds to batch snapshot writes
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+ADAPTER_STAGGER = 2  # seconds between BLE sessions on the same adapter
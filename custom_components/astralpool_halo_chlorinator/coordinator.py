@@ -1,93 +1,627 @@
 """Data coordinator for receiving Chlorinator updates."""
 
-from datetime import timedelta
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 import logging
+import time
 from typing import Any
 
+from pychlorinator import halo_parsers
 from pychlorinator.halochlorinator import HaloChlorinatorAPI
 
-from homeassistant.core import HomeAssistant
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .analytics import CHEMISTRY, ChemistryTrend
+from .cellwear import CellWearEstimator
+from .commands import CommandQueue
+from .const import (
+    DEFAULT_STALE_AFTER,
+    DEFAULT_TREND_WINDOW,
+    DOMAIN,
+    POLL_INTERVAL_FAST,
+    POLL_RETRY_LIMIT,
+    PUSH_DEBOUNCE,
+    PUSH_WATCHDOG_INTERVAL,
+    SLOW_READ_INTERVAL,
+    SOURCE_ADVERTISEMENT,
+    SOURCE_NOTIFICATION,
+    SOURCE_POLL,
+    USER_ACTION_WINDOW,
+)
+from .derived import DerivedValues
+from .dosing import DosingAccumulator
+from .metrics import ChlorinatorMetrics
+from .polling import (
+    FAST_READS,
+    SLOW_READS,
+    adaptive_interval,
+    read_plan,
+    retry_interval,
+)
+from .scheduler import BluetoothScheduler
+from .session import HaloSession
+from .storage import (
+    SECTION_CELL_WEAR,
+    SECTION_DOSING,
+    SECTION_FRESHNESS,
+    SECTION_SNAPSHOT,
+    SECTION_TURNOVER,
+    ChlorinatorStore,
+    decode_data,
+    encode_data,
+)
+from .turnover import TurnoverTracker
 
 _LOGGER = logging.getLogger(__name__)
 
+# Data keys that decide which optional entities a chlorinator gets
+CAPABILITY_KEYS = ("SolarEnabled", "HeaterEnabled", "LightingEnabled", "NumZonesInUse")
+
+# Action enum -> (pychlorinator frame class, one-shot API write method,
+# characteristics that reflect the result)
+ACTION_WRITERS = {
+    halo_parsers.ChlorinatorActions: (
+        halo_parsers.ChlorinatorAction,
+        "async_write_action",
+        (201, 202),
+    ),
+    halo_parsers.HeaterAppActions: (
+        halo_parsers.HeaterAction,
+        "async_write_heater_action",
+        (1102,),
+    ),
+    halo_parsers.SolarAppActions: (
+        halo_parsers.SolarAction,
+        "async_write_solar_action",
+        (1202,),
+    ),
+    halo_parsers.LightAppActions: (
+        halo_parsers.LightAction,
+        "async_write_light_action",
+        (300,),
+    ),
+}
+
 
 class ChlorinatorDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Data coordinator for getting Chlorinator updates."""
 
-    def __init__(self, hass: HomeAssistant, chlorinator: HaloChlorinatorAPI) -> None:
-        """Initialise the coordinator."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        chlorinator: HaloChlorinatorAPI,
+        address: str,
+        scheduler: BluetoothScheduler,
+        session: HaloSession | None = None,
+        keep_connected: bool = False,
+        push: bool = False,
+        store: ChlorinatorStore | None = None,
+        stale_after: float = DEFAULT_STALE_AFTER,
+        trend_window: float = DEFAULT_TREND_WINDOW,
+    ) -> None:
+        """Initialise the coordinator.
+
+        BLE sessions are run through the shared scheduler so chlorinators on
+        the same adapter take turns. Actions are queued and written in
+        batches over the session. With keep_connected the session is also
+        held open across polls, which then only read what polling.read_plan
+        asks for; otherwise every poll is a one-shot full gather.
+        With push enabled, frames the chlorinator notifies are published as
+        they arrive and polling is only kept as a slow watchdog, on a timer
+        of its own so pushes cannot delay it. Otherwise the poll interval
+        adapts to what the chlorinator is doing, see
+        polling.adaptive_interval. The last data is kept in store so a
+        restart can start from it.
+
+        Every value carries when and how it was last read, see freshness.
+        Values that go unread for stale_after seconds count as stale. pH
+        and ORP trends over trend_window seconds are added to the data as
+        it is published, see analytics.ChemistryTrend, as are the
+        cell wear totals of cellwear.CellWearEstimator and the acid dosing
+        totals of dosing.DosingAccumulator and the filtration progress of
+        turnover.TurnoverTracker.
+        """
+        self.keep_connected = keep_connected and session is not None
+        self.push = push and self.keep_connected
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=20),
+            name=f"{DOMAIN} {address}",
+            update_interval=None
+            if self.push
+            else timedelta(seconds=POLL_INTERVAL_FAST),
         )
-        self._data_age = 0
+        self._last_user_action = 0.0
         self.data = {}
         self.chlorinator = chlorinator
+        self.address = address
+        self.scheduler = scheduler
+        self.session = session
+        self.store = store
+        self.restored = False
+        self.changed_keys: set[str] | None = None
+        self._published: dict[str, Any] = {}
+        self._published_success = True
+        self._pushed: dict[str, Any] = {}
+        self._unsub_push_flush: CALLBACK_TYPE | None = None
+        self._supported: frozenset[int] = frozenset()
+        self._slow_read_at = 0.0
+        self.commands = CommandQueue(hass, self.name, self._async_execute_actions)
+        self.metrics = ChlorinatorMetrics(session.connect_time if session else None)
+        if self.push:
+            session.set_push_listener(self._async_handle_push, self._async_ble_slot)
+        # Shared by all entities; versions are filled in once they are read
         self.device_info = DeviceInfo(
-            identifiers={(DOMAIN, "1234")},
+            identifiers={(DOMAIN, address)},
+            connections={(dr.CONNECTION_BLUETOOTH, address.upper())},
             manufacturer="Astral Pool",
-            name="HCHLOR",
+            model="Halo Chlor",
+            # The Halo advertises as HCHLOR; the address tells pools apart
+            name=f"HCHLOR {address.replace(':', '')[-4:].upper()}",
         )
-        self.added_entities = set()
-        self.add_sensor_callback = None
-        self.add_binary_sensor_callback = None
-        self.add_dynamic_select_entities = None
+        self.capabilities: dict[str, Any] = {}
+        self._capability_listeners: list[CALLBACK_TYPE] = []
+        self.present = True
+        self.stale = False
+        self.stale_after = stale_after
+        self.freshness: dict[str, tuple[datetime, str]] = {}
+        trends = [ChemistryTrend(*chemistry, trend_window) for chemistry in CHEMISTRY]
+        stored = store.get if store is not None else lambda section: None
+        self.cell_wear = CellWearEstimator(stored(SECTION_CELL_WEAR))
+        self.dosing = DosingAccumulator(stored(SECTION_DOSING))
+        self.turnover = TurnoverTracker(stored(SECTION_TURNOVER))
+        # Store section -> derived values kept across restarts
+        self._stored_values: dict[str, DerivedValues] = {
+            SECTION_CELL_WEAR: self.cell_wear,
+            SECTION_DOSING: self.dosing,
+            SECTION_TURNOVER: self.turnover,
+        }
+        self.derived: list[DerivedValues] = [*trends, *self._stored_values.values()]
+        # Derived key -> the reading it goes stale with
+        self.derived_sources = {
+            key: source
+            for values in self.derived
+            for key, source in values.outputs.items()
+        }
+        self._advertised: dict[str, Any] = {}
 
-    def reset_data_age(self):
-        """Resets the data age to 3 to make sure async_gatherdata is executed."""
-        self._data_age = 3
+    @callback
+    def async_restore(self) -> bool:
+        """Start from the stored snapshot; return False when there is none."""
+        if self.store is None or not (snapshot := self.store.get(SECTION_SNAPSHOT)):
+            return False
+        # Derived values are worked out again from the restored readings
+        self.data = {
+            key: value
+            for key, value in decode_data(snapshot).items()
+            if key not in self.derived_sources
+        }
+        for key, (updated, source) in (self.store.get(SECTION_FRESHNESS) or {}).items():
+            if key in self.data and (updated := dt_util.parse_datetime(updated)):
+                self.freshness[key] = (updated, source)
+        self._derive(self.data)
+        self.restored = True
+        self._async_update_capabilities()
+        self._async_update_device_info()
+        _LOGGER.debug("Restored %s values for %s", len(self.data), self.address)
+        return True
 
-    async def _async_update_data(self):
-        """Fetch data from API endpoint."""
-        self._data_age += 1
-        _LOGGER.debug("_data_age: %s", self._data_age)
-        if self._data_age >= 3:  # 3 polling events = 60 seconds
+    @callback
+    def _async_mark_fresh(self, keys: Iterable[str], source: str) -> None:
+        """Note that keys were just read from source."""
+        now = dt_util.utcnow()
+        for key in keys:
+            self.freshness[key] = (now, source)
+
+    def key_stale_after(self, key: str) -> float | None:
+        """Return after how many seconds key is stale; None if it never is."""
+        if not self.keep_connected:
+            # A one-shot gather reads everything on every poll
+            return self.stale_after
+        cmd_type = self.session.key_types.get(key)
+        if cmd_type in FAST_READS:
+            return self.stale_after
+        if cmd_type in SLOW_READS:
+            return max(self.stale_after, 2 * SLOW_READ_INTERVAL)
+        # Installation data is only read by a full gather
+        return None
+
+    def is_fresh(self, key: str) -> bool:
+        """Return False once key has gone unread for too long."""
+        if key not in self.freshness or (limit := self.key_stale_after(key)) is None:
+            return True
+        return (dt_util.utcnow() - self.freshness[key][0]).total_seconds() < limit
+
+    @callback
+    def async_add_capability_listener(self, listener: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call listener whenever the capabilities change; return a remover."""
+        self._capability_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._capability_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def _async_update_capabilities(self) -> None:
+        """Notify capability listeners, but only if a capability changed."""
+        data = self.data or {}
+        capabilities = {key: data[key] for key in CAPABILITY_KEYS if key in data}
+        if not capabilities or capabilities == self.capabilities:
+            return
+        _LOGGER.debug("Capabilities: %s", capabilities)
+        self.capabilities = capabilities
+        for listener in list(self._capability_listeners):
+            listener()
+
+    @callback
+    def async_set_advertisement(self, advertised: dict[str, Any]) -> None:
+        """Take in what the Halo advertises; poll now if its status changed."""
+        came_back, self.present = not self.present, True
+        self._async_mark_fresh(advertised, SOURCE_ADVERTISEMENT)
+        status_changed = (
+            "DeviceStatus" in self._advertised
+            and advertised["DeviceStatus"] != self._advertised["DeviceStatus"]
+        )
+        if advertised == self._advertised and not came_back:
+            return
+        _LOGGER.debug("Advertised by %s: %s", self.address, advertised)
+        self._advertised = advertised
+        if not self.data:
+            return
+        self.data = {**self.data, **advertised}
+        self.async_update_listeners()
+        if (came_back or status_changed) and not self.push:
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_set_absent(self) -> None:
+        """Skip polls until the Halo advertises again."""
+        if self.session is not None and self.session.is_connected:
+            # A connected Halo does not advertise
+            return
+        _LOGGER.debug("%s stopped advertising", self.address)
+        self.present = False
+
+    @callback
+    def _async_update_device_info(self) -> None:
+        """Carry the versions the Halo reports into the device info."""
+        data = self.data or {}
+        # The device profile is only read on a full gather; fall back to the ad
+        major = data.get("FirmwareVersionMajor", data.get("FirmwareMajorVersion"))
+        minor = data.get("FirmwareVersionMinor", data.get("FirmwareMinorVersion"))
+        versions = {}
+        if major is not None and minor is not None:
+            versions["sw_version"] = f"{major}.{minor}"
+        if (hardware := data.get("HardwareVersion")) is not None:
+            versions["hw_version"] = str(hardware)
+        if (serial := data.get("SerialNumber")) is not None:
+            versions["serial_number"] = str(serial)
+        if all(self.device_info.get(key) == value for key, value in versions.items()):
+            return
+        _LOGGER.debug("Device versions of %s: %s", self.address, versions)
+        self.device_info.update(versions)
+        registry = dr.async_get(self.hass)
+        if device := registry.async_get_device(
+            identifiers=self.device_info["identifiers"]
+        ):
+            registry.async_update_device(device.id, **versions)
+
+    def note_user_action(self) -> None:
+        """Poll fast for a while after the user changed something."""
+        self._last_user_action = time.monotonic()
+        if not self.push:
+            self.update_interval = timedelta(seconds=POLL_INTERVAL_FAST)
+
+    async def async_write_action(
+        self, action, zone: int | None = None, confirmed: bool = False
+    ) -> None:
+        """Queue an action; return once it is written to the chlorinator.
+
+        zone addresses a lighting zone, counted from 0. Entities show their
+        requested state optimistically until the read back that follows the
+        batch confirms it; with confirmed, return only after that read back.
+        """
+        self.note_user_action()
+        await self.commands.async_submit(
+            (type(action), zone), (action, zone), confirmed
+        )
+
+    async def async_read_now(
+        self, cmd_types: Iterable[int] | None = None
+    ) -> dict[str, Any]:
+        """Read cmd_types, or everything, in one session and publish them.
+
+        Returns the values read. Characteristics the chlorinator did not
+        send in its last full read are skipped. Without a session only
+        everything can be read, through a regular refresh.
+        """
+        if cmd_types is not None and self._supported:
+            if not (cmd_types := frozenset(cmd_types) & self._supported):
+                return {}
+        if self.session is None:
+            await self._async_refresh_or_raise()
+            return dict(self.data or {})
+        async with self._async_ble_slot():
+            start = time.monotonic()
             try:
+                if cmd_types is None:
+                    decoded = await self.session.async_gatherdata()
+                else:
+                    decoded = await self.session.async_read(cmd_types)
+                self.metrics.gather.add(time.monotonic() - start)
+            finally:
+                if not self.keep_connected:
+                    await self.session.async_disconnect()
+        if cmd_types is None:
+            self._supported = self.session.received
+            self._slow_read_at = time.monotonic()
+        _LOGGER.debug("Read now %s: %s", cmd_types, decoded)
+        self._async_mark_fresh(decoded, SOURCE_POLL)
+        self.async_set_updated_data({**(self.data or {}), **decoded})
+        return decoded
+
+    async def _async_refresh_or_raise(self) -> None:
+        """Refresh now; raise UpdateFailed unless the poll read the chlorinator.
+
+        A failed or skipped poll keeps the last data and does not fail the
+        refresh, see _async_update_data.
+        """
+        last_success = self.metrics.last_success
+        await self.async_refresh()
+        if self.metrics.last_success == last_success:
+            raise UpdateFailed(f"Could not read {self.address}")
+
+    async def _async_execute_actions(
+        self, actions: list[tuple[Any, int | None]], written: Callable[[], None]
+    ) -> None:
+        """Write a batch of actions in one BLE session, then read back once."""
+        start = time.monotonic()
+        if self.session is None:
+            async with self._async_ble_slot():
+                for action, _ in actions:
+                    await getattr(self.chlorinator, ACTION_WRITERS[type(action)][1])(
+                        action
+                    )
+            written()
+            # One-shot links can only read everything
+            await self._async_refresh_or_raise()
+            self.metrics.confirm.add(time.monotonic() - start)
+            return
+        frames = []
+        cmd_types: set[int] = set()
+        for action, zone in actions:
+            frame_class, _, confirm_reads = ACTION_WRITERS[type(action)]
+            if zone is None:
+                frames.append(bytes(frame_class(action)))
+            else:
+                frames.append(bytes(frame_class(action, lighting_zone=zone)))
+            cmd_types.update(confirm_reads)
+        async with self._async_ble_slot():
+            try:
+                await self.session.async_write(*frames)
+                written()
+                decoded = await self.session.async_read(cmd_types)
+            finally:
+                if not self.keep_connected:
+                    await self.session.async_disconnect()
+        _LOGGER.debug("Read back %s: %s", sorted(cmd_types), decoded)
+        self._async_mark_fresh(decoded, SOURCE_POLL)
+        self.metrics.confirm.add(time.monotonic() - start)
+        self.async_set_updated_data({**(self.data or {}), **decoded})
+
+    async def async_shutdown(self) -> None:
+        """Release the held session, if any."""
+        await super().async_shutdown()
+        if self._unsub_push_flush is not None:
+            self._unsub_push_flush()
+            self._unsub_push_flush = None
+        self.commands.cancel()
+        if self.session is not None:
+            await self.session.async_close()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Work out which keys changed since the last publish, then notify.
+
+        ``changed_keys`` is None when every entity has to write, e.g. when
+        availability flipped.
+        """
+        data = self.data or {}
+        if data:
+            self._derive(data)
+        if self.last_update_success != self._published_success:
+            self.changed_keys = None
+        else:
+            self.changed_keys = {
+                key
+                for key in data.keys() | self._published.keys()
+                if data.get(key) != self._published.get(key)
+            }
+        self._published = dict(data)
+        self._published_success = self.last_update_success
+        _LOGGER.debug("Changed keys: %s", self.changed_keys)
+        self._async_update_capabilities()
+        self._async_update_device_info()
+        if self.store is not None and data:
+            self.store.async_set(SECTION_SNAPSHOT, self._snapshot)
+            self.store.async_set(SECTION_FRESHNESS, self._freshness_snapshot)
+            for section, values in self._stored_values.items():
+                self.store.async_set(section, values.as_dict)
+        super().async_update_listeners()
+
+    def _derive(self, data: dict[str, Any]) -> None:
+        """Merge in the values derived from the readings."""
+        for values in self.derived:
+            data.update(values.update(data, self.freshness))
+
+    @callback
+    def async_start_watchdog(self) -> CALLBACK_TYPE:
+        """Poll every PUSH_WATCHDOG_INTERVAL; return a callback that stops it.
+
+        Publishing pushed data reschedules the coordinator's own refresh, so
+        the watchdog does not use it.
+        """
+
+        @callback
+        def watchdog(_now) -> None:
+            self.hass.async_create_background_task(
+                self.async_refresh(), f"{self.name} watchdog"
+            )
+
+        return async_track_time_interval(
+            self.hass, watchdog, timedelta(seconds=PUSH_WATCHDOG_INTERVAL)
+        )
+
+    @callback
+    def _async_handle_push(self, decoded: dict[str, Any]) -> None:
+        """Queue a notified frame; a burst of frames is published once."""
+        self._pushed.update(decoded)
+        if self._unsub_push_flush is None:
+            self._unsub_push_flush = async_call_later(
+                self.hass, PUSH_DEBOUNCE, self._async_flush_push
+            )
+
+    @callback
+    def _async_flush_push(self, _now=None) -> None:
+        self._unsub_push_flush = None
+        pushed, self._pushed = self._pushed, {}
+        _LOGGER.debug("Pushed update: %s", sorted(pushed))
+        self._async_mark_fresh(pushed, SOURCE_NOTIFICATION)
+        self.async_set_updated_data({**(self.data or {}), **pushed})
+
+    def _snapshot(self) -> dict[str, Any]:
+        return encode_data(
+            {
+                key: value
+                for key, value in (self.data or {}).items()
+                if key not in self.derived_sources
+            }
+        )
+
+    def _freshness_snapshot(self) -> dict[str, tuple[str, str]]:
+        return {
+            key: (updated.isoformat(), source)
+            for key, (updated, source) in self.freshness.items()
+        }
+
+    @asynccontextmanager
+    async def _async_ble_slot(self) -> AsyncIterator[None]:
+        """Hold the scheduler slot of the adapter currently reaching us."""
+        service_info = bluetooth.async_last_service_info(
+            self.hass, self.address.upper(), connectable=True
+        )
+        if service_info is not None:
+            self.metrics.rssi = service_info.rssi
+            if self.session is not None:
+                self.session.set_ble_device(service_info.device)
+            # pychlorinator has no setter; without this a one-shot gather
+            # stays on the device seen at setup, or on none at all
+            self.chlorinator._ble_device = (  # pylint: disable=protected-access
+                service_info.device
+            )
+        source = service_info.source if service_info else "default"
+        start = time.monotonic()
+        async with self.scheduler.async_slot(source, self.address):
+            self.metrics.slot_wait.add(time.monotonic() - start)
+            yield
+
+    async def _async_gatherdata(self) -> dict[str, Any]:
+        """Return what the read plan asks for; everything on the first poll.
+
+        Only a held session reads by plan. Otherwise every poll is
+        pychlorinator's one-shot gather, which lets the Halo drop the link
+        itself to keep its BLE from hanging.
+        """
+        if not self.keep_connected:
+            async with self._async_ble_slot():
+                start = time.monotonic()
                 data = await self.chlorinator.async_gatherdata()
-                _LOGGER.debug("halo_ble_client finish: %s", dict(sorted(data.items())))
-            except Exception as e:
-                _LOGGER.warning("Failed _gatherdata: %s %s", self._data_age, e)
-                data = {}
-            if data != {}:
-                self.data = data
-                self._data_age = 0
-
-                if "SolarEnabled" in data and data["SolarEnabled"] == 1:
-                    _LOGGER.debug("SolarEnabled : %s", data["SolarEnabled"])
-                    if hasattr(self, "add_sensor_callback"):
-                        await self.add_sensor_callback("SolarEnabled")
-                    if hasattr(self, "add_binary_sensor_callback"):
-                        await self.add_binary_sensor_callback("SolarEnabled")
-                    if hasattr(self, "add_dynamic_select_entities"):
-                        await self.add_dynamic_select_entities("SolarEnabled")
-
-                if "HeaterEnabled" in data and data["HeaterEnabled"] == 1:
-                    _LOGGER.debug("HeaterEnabled : %s", data["HeaterEnabled"])
-                    if hasattr(self, "add_sensor_callback"):
-                        await self.add_sensor_callback("HeaterEnabled")
-                    if hasattr(self, "add_binary_sensor_callback"):
-                        await self.add_binary_sensor_callback("HeaterEnabled")
-                    if hasattr(self, "add_dynamic_select_entities"):
-                        await self.add_dynamic_select_entities("HeaterEnabled")
-
-                if "PoolSpaEnabled" in data and data["PoolSpaEnabled"] == 1:
-                    _LOGGER.debug("PoolSpaEnabled : %s", data["PoolSpaEnabled"])
-
-                if "LightingEnabled" in data and data["LightingEnabled"] == 1:
-                    _LOGGER.debug("LightingEnabled : %s", data["LightingEnabled"])
-                    _LOGGER.debug("NumZonesInUse : %s", data["NumZonesInUse"])
-                    if hasattr(self, "add_dynamic_select_entities"):
-                        await self.add_dynamic_select_entities("LightingEnabled")
-
-            elif self._data_age >= 15:  # 15 polling events  = 5 minutes
-                self.data = {}
-                _LOGGER.error("Failed _gatherdata, giving up: %s", self._data_age)
-                raise UpdateFailed("Error communicating with API")
+                self.metrics.gather.add(time.monotonic() - start)
+                return data
+        now = time.monotonic()
+        slow_due = now - self._slow_read_at >= SLOW_READ_INTERVAL
+        plan = None
+        if self._supported and self.data:
+            plan = read_plan(self._supported, slow_due)
+        async with self._async_ble_slot():
+            start = time.monotonic()
+            try:
+                if plan is None:
+                    data = await self.session.async_gatherdata()
+                    self._supported = self.session.received
+                else:
+                    _LOGGER.debug("Reading %s", sorted(plan))
+                    data = await self.session.async_read(plan)
+                self.metrics.gather.add(time.monotonic() - start)
+            except Exception:
+                # Start over with a full gather
+                self._supported = frozenset()
+                raise
+        if slow_due or plan is None:
+            self._slow_read_at = now
+        return data
+
+    async def _async_update_data(self):
+        """Fetch data from API endpoint.
+
+        Failed polls only space out the next ones, see polling.retry_interval.
+        The values read before stay and each goes unavailable once it is
+        stale, see is_fresh.
+        """
+        if not self.present:
+            _LOGGER.debug("%s is not advertising, skipping poll", self.address)
+            return self.data
+        try:
+            data = await self._async_gatherdata()
+            _LOGGER.debug("halo_ble_client finish: %s", dict(sorted(data.items())))
+        except Exception as e:
+            _LOGGER.warning(
+                "Failed _gatherdata, failure %s in a row: %s",
+                self.metrics.consecutive_failures + 1,
+                e,
+            )
+            data = {}
+        if data != {}:
+            self._async_mark_fresh(data, SOURCE_POLL)
+            # Values that were not read this time stay, with their own age
+            previous = self.data or {}
+            self.data = {**previous, **data, **self._advertised}
+            if self.metrics.consecutive_failures >= POLL_RETRY_LIMIT:
+                _LOGGER.info("%s is reachable again", self.address)
+            self.metrics.consecutive_failures = 0
+            self.stale = False
+            self.metrics.last_success = dt_util.utcnow()
+            if not self.push:
+                self.update_interval = adaptive_interval(
+                    previous,
+                    self.data,
+                    time.monotonic() - self._last_user_action < USER_ACTION_WINDOW,
+                )
+                _LOGGER.debug("Next poll in %s", self.update_interval)
+        else:
+            self.metrics.retries += 1
+            self.metrics.consecutive_failures += 1
+            failures = self.metrics.consecutive_failures
+            # The last good data stays, but is no longer current
+            self.stale = bool(self.data)
+            if not self.push:
+                self.update_interval = retry_interval(failures)
+                _LOGGER.debug("Retrying in %s", self.update_interval)
+            if failures == POLL_RETRY_LIMIT:
+                _LOGGER.error(
+                    "%s failed %s polls in a row, only retrying every %s",
+                    self.address,
+                    failures,
+                    self.update_interval or timedelta(seconds=PUSH_WATCHDOG_INTERVAL),
+                )
 
         return self.data
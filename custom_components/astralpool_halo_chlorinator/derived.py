@@ -0,0 +1,63 @@
+"""Shared plumbing of the values derived from the chlorinator's readings."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+
+class DerivedValues:
+    """Sample one reading each time it is read again and derive values from it.
+
+    The reading's freshness tells when it was taken, so republishing data
+    does not sample it twice. Subclasses name the reading in source and the
+    keys they add in outputs, each mapped to the reading it goes stale with,
+    and do their maths in sample and derive. The last sample and whatever
+    state returns are stored, and handed back to restore after a restart.
+    """
+
+    source: str
+    outputs: Mapping[str, str]
+
+    def __init__(self, stored: Mapping[str, Any] | None = None) -> None:
+        """Initialise, continuing from stored state if there is any."""
+        stored = stored or {}
+        self.last: tuple[float, float] | None = (
+            tuple(stored["last"]) if stored.get("last") else None
+        )
+        self.restore(stored)
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        """Pick up the stored state; there is none by default."""
+
+    def state(self) -> dict[str, Any]:
+        """Return the state to store along with the last sample."""
+        return {}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return everything to store."""
+        return {**self.state(), "last": self.last}
+
+    def update(
+        self, data: dict[str, Any], freshness: dict[str, tuple[datetime, str]]
+    ) -> dict[str, Any]:
+        """Sample the reading if it was read again; return the derived values."""
+        value = data.get(self.source)
+        if self.source in freshness and isinstance(value, (int, float)):
+            read_at = dt_util.as_local(freshness[self.source][0])
+            if self.last is None or read_at.timestamp() > self.last[0]:
+                self.sample(read_at, value, data)
+                self.last = (read_at.timestamp(), value)
+        if self.last is None:
+            return {}
+        return self.derive(data)
+
+    def sample(self, read_at: datetime, value: float, data: dict[str, Any]) -> None:
+        """Take in a new reading; last still holds the one before."""
+        raise NotImplementedError
+
+    def derive(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return the derived values."""
+        raise NotImplementedError
@@ -0,0 +1,45 @@
+"""Diagnostics support for the Astral Pool Halo Chlorinator integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .models import ChlorinatorData
+from .storage import encode_data
+
+TO_REDACT = {CONF_ACCESS_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: ChlorinatorData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "keep_connected": coordinator.keep_connected,
+            "push": coordinator.push,
+            "present": coordinator.present,
+            "stale": coordinator.stale,
+            "restored": coordinator.restored,
+            "capabilities": encode_data(coordinator.capabilities),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "filtration": coordinator.turnover.days,
+        "freshness": {
+            key: {"last_updated": updated, "source": source}
+            for key, (updated, source) in coordinator.freshness.items()
+        },
+        "data": encode_data(coordinator.data or {}),
+    }
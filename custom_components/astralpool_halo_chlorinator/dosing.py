@@ -0,0 +1,82 @@
+"""Acid dosed over time, pieced together from the device's daily total."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import DOSING_RESET_GRACE, DOSING_ROLLUP_DAYS
+from .derived import DerivedValues
+
+
+class DosingAccumulator(DerivedValues):
+    """Turn DosingPumpSecs, which restarts at 0 each day, into running totals.
+
+    A fresh reading below the one before means the device started a new
+    day, and counts in full. So does a reading on a later day taken more
+    than DOSING_RESET_GRACE after midnight, which covers a reset missed
+    while the Halo was out of reach; within the grace the device clock may
+    not have reached midnight yet, so only the increase is counted. What
+    was dosed between the last reading of a day and the device's midnight
+    is lost if no reading was taken in between. The first reading counts
+    in full, as the device's total for that day.
+    """
+
+    source = "DosingPumpSecs"
+    outputs = dict.fromkeys(
+        ("dosing_total", "dosing_yesterday", "dosing_week"), "DosingPumpSecs"
+    )
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        """Pick up the stored totals."""
+        self.total: float = stored.get("total", 0.0)
+        self.days: dict[str, float] = dict(stored.get("days", {}))
+        self.week: float = sum(self.days.values())
+
+    def state(self) -> dict[str, Any]:
+        """Return the totals to store."""
+        return {"total": self.total, "days": self.days}
+
+    def sample(self, read_at: datetime, value: float, data: dict[str, Any]) -> None:
+        """Add what was dosed since the previous reading."""
+        self._add(
+            read_at.date(),
+            value if self.last is None else self._dosed_since(read_at, value),
+        )
+
+    def derive(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return the running totals."""
+        today = dt_util.now().date()
+        self._expire(today)
+        return {
+            "dosing_total": round(self.total, 1),
+            "dosing_yesterday": self.days.get((today - timedelta(days=1)).isoformat()),
+            "dosing_week": round(self.week, 1),
+        }
+
+    def _dosed_since(self, read_at: datetime, value: float) -> float:
+        """Return what was dosed since the previous reading."""
+        last_time, last_value = self.last
+        midnight = dt_util.start_of_local_day(read_at)
+        if value < last_value or (
+            last_time < midnight.timestamp()
+            and read_at - midnight > timedelta(seconds=DOSING_RESET_GRACE)
+        ):
+            return value
+        return value - last_value
+
+    def _add(self, day: date, dosed: float) -> None:
+        """Add to the total and the day's rollup, dropping days gone by."""
+        self._expire(day)
+        key = day.isoformat()
+        self.days[key] = round(self.days.get(key, 0.0) + dosed, 1)
+        self.total += dosed
+        self.week += dosed
+
+    def _expire(self, today: date) -> None:
+        """Forget the days that have left the weekly rollup."""
+        oldest = (today - timedelta(days=DOSING_ROLLUP_DAYS - 1)).isoformat()
+        for key in [key for key in self.days if key < oldest]:
+            self.week -= self.days.pop(key)
@@ -0,0 +1,125 @@
+"""Base entity for the Astral Pool Halo Chlorinator integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import FRESHNESS_REPORT_INTERVAL
+from .coordinator import ChlorinatorDataUpdateCoordinator
+
+CapabilityTable = Mapping[
+    str, Callable[[ChlorinatorDataUpdateCoordinator], Iterable[Entity]]
+]
+
+
+@callback
+def async_setup_capability_entities(
+    coordinator: ChlorinatorDataUpdateCoordinator,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    entities: list[Entity],
+    table: CapabilityTable,
+) -> None:
+    """Add entities plus those of the present capabilities, then follow changes.
+
+    table maps a capability key to a factory for the entities it brings.
+    Factories are only evaluated when the capabilities change, and entities
+    that were already added are skipped by unique id.
+    """
+    added: set[str | None] = set()
+
+    @callback
+    def add_entities(new_entities: list[Entity]) -> None:
+        for capability, factory in table.items():
+            if coordinator.capabilities.get(capability):
+                new_entities.extend(
+                    entity
+                    for entity in factory(coordinator)
+                    if entity.unique_id not in added
+                )
+        added.update(entity.unique_id for entity in new_entities)
+        if new_entities:
+            async_add_entities(new_entities)
+
+    add_entities(entities)
+    entry.async_on_unload(
+        coordinator.async_add_capability_listener(lambda: add_entities([]))
+    )
+
+
+class ChlorinatorEntity(CoordinatorEntity[ChlorinatorDataUpdateCoordinator]):
+    """Coordinator entity that only writes state when its data keys change.
+
+    The entity goes unavailable once one of its values is stale. Its
+    last_updated and source attributes tell when and how its newest value
+    was read; for values that did not change they are refreshed every
+    FRESHNESS_REPORT_INTERVAL rather than on every poll.
+    """
+
+    _data_keys: tuple[str, ...] = ()
+    _written_available: bool | None = None
+    _written_updated: datetime | None = None
+
+    def __init__(self, coordinator: ChlorinatorDataUpdateCoordinator) -> None:
+        """Attach the entity to the chlorinator's shared device."""
+        super().__init__(coordinator)
+        self._attr_device_info = coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Remember what the first state write shows."""
+        await super().async_added_to_hass()
+        self._written_available = self.available
+        if freshness := self._freshness():
+            self._written_updated = freshness[0]
+
+    @property
+    def available(self) -> bool:
+        """Return False once any of the entity's values is stale."""
+        return super().available and all(
+            self.coordinator.is_fresh(key) for key in self._data_keys
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return when and how the newest of the entity's values was read."""
+        if (freshness := self._freshness()) is None:
+            return None
+        updated, source = freshness
+        return {"last_updated": updated.isoformat(), "source": source}
+
+    def _freshness(self) -> tuple[datetime, str] | None:
+        freshness = self.coordinator.freshness
+        return max(
+            (freshness[key] for key in self._data_keys if key in freshness),
+            default=None,
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip the state write when nothing the entity shows changed."""
+        changed = self.coordinator.changed_keys
+        available = self.available
+        freshness = self._freshness()
+        updated = freshness[0] if freshness else None
+        if (
+            changed is not None
+            and changed.isdisjoint(self._data_keys)
+            and available == self._written_available
+            and (
+                updated is None
+                or self._written_updated is None
+                or (updated - self._written_updated).total_seconds()
+                < FRESHNESS_REPORT_INTERVAL
+            )
+        ):
+            return
+        self._written_available = available
+        self._written_updated = updated
+        super()._handle_coordinator_update()
@@ -0,0 +1,74 @@
+"""Refresh health counters and timings of one chlorinator."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from .const import METRICS_WINDOW
+
+
+class TimingStats:
+    """Durations kept in a fixed-size ring buffer, with rolling percentiles."""
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialise the buffer."""
+        self._samples: deque[float] = deque(maxlen=size)
+        self.last: float | None = None
+
+    def add(self, seconds: float) -> None:
+        """Record a duration, dropping the oldest once the buffer is full."""
+        self._samples.append(seconds)
+        self.last = seconds
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the pct percentile (nearest rank) of the buffered samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[round(pct / 100 * (len(ordered) - 1))]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return last, p50 and p95 in seconds plus the sample count."""
+        return {
+            "last": _round(self.last),
+            "p50": _round(self.percentile(50)),
+            "p95": _round(self.percentile(95)),
+            "count": len(self._samples),
+        }
+
+
+def _round(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds, 3)
+
+
+class ChlorinatorMetrics:
+    """What it took to reach the chlorinator lately.
+
+    slot_wait grows with adapter or proxy congestion, connect with a weak
+    signal and gather (minus connect) with a slow device.
+    """
+
+    def __init__(self, connect: TimingStats | None = None) -> None:
+        """Initialise the metrics; connect is shared with the session."""
+        self.slot_wait = TimingStats()
+        self.connect = connect or TimingStats()
+        self.gather = TimingStats()
+        self.confirm = TimingStats()
+        self.rssi: int | None = None
+        self.retries = 0
+        self.consecutive_failures = 0
+        self.last_success: datetime | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return everything for the diagnostics dump."""
+        return {
+            "slot_wait": self.slot_wait.as_dict(),
+            "connect": self.connect.as_dict(),
+            "gather": self.gather.as_dict(),
+            "confirm": self.confirm.as_dict(),
+            "rssi": self.rssi,
+            "retries": self.retries,
+            "consecutive_failures": self.consecutive_failures,
+            "last_success": self.last_success,
+        }
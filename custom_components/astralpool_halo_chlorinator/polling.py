@@ -0,0 +1,97 @@
+"""Adaptive poll interval and read plan derived from the chlorinator's state."""
+from __future__ import annotations
+
+from datetime import timedelta
+import random
+from typing import Any
+
+from pychlorinator import halo_parsers
+
+from .const import (
+    CIRCUIT_OPEN_INTERVAL,
+    POLL_INTERVAL_ACTIVE,
+    POLL_INTERVAL_FAST,
+    POLL_INTERVAL_IDLE,
+    POLL_INTERVAL_STANDBY,
+    POLL_RETRY_LIMIT,
+    RETRY_BACKOFF_MAX,
+    RETRY_JITTER,
+)
+
+# Chemistry, equipment and zone state, read on every poll.
+FAST_READS = frozenset({9, 101, 104, 201, 202, 300, 1102, 1202})
+# Settings, setpoints and statistics, read every SLOW_READ_INTERVAL.
+SLOW_READS = frozenset({100, 102, 106, 206, 600, 601, 602, 1101, 1104, 1201})
+# Everything else (device profile, capability flags, zone and relay setup)
+# only changes with the installation and comes with the first full gather.
+
+# Characteristics behind each group refresh_now can be asked for.
+READ_GROUPS = {
+    "state": frozenset({104, 201, 202, 206}),
+    "chemistry": frozenset({9, 102, 600}),
+    "water": frozenset({101}),
+    "cell": frozenset({601, 602}),
+    "heater": frozenset({1101, 1102, 1104}),
+    "solar": frozenset({1201, 1202}),
+    "lighting": frozenset({300}),
+    "maintenance": frozenset({100, 106}),
+}
+
+# Keys that are truthy while some equipment runs.
+RUNNING_KEYS = ("pump_is_operating", "cell_is_operating", "HeaterOn", "SolarPumpState")
+
+# Keys whose change means the system is in transition and worth watching.
+TRANSITION_KEYS = (
+    "mode",
+    "pump_speed",
+    "pump_is_operating",
+    "cell_is_operating",
+    "HeaterOn",
+    "SolarPumpState",
+)
+
+
+def adaptive_interval(
+    previous: dict[str, Any], data: dict[str, Any], user_action: bool
+) -> timedelta:
+    """Return how long to wait before the next poll.
+
+    Fast right after a user action or while equipment is switching, the
+    original cadence while it runs, and minutes once everything is off.
+    """
+    if user_action or any(
+        previous.get(key) != data.get(key) for key in TRANSITION_KEYS
+    ):
+        return timedelta(seconds=POLL_INTERVAL_FAST)
+    if any(data.get(key) for key in RUNNING_KEYS):
+        return timedelta(seconds=POLL_INTERVAL_ACTIVE)
+    if data.get("mode") is halo_parsers.Mode.Off:
+        return timedelta(seconds=POLL_INTERVAL_IDLE)
+    # Auto with the pump off: a timer may start it, so look a bit more often.
+    return timedelta(seconds=POLL_INTERVAL_STANDBY)
+
+
+def retry_interval(failures: int) -> timedelta:
+    """Return how long to wait after failures failed polls in a row.
+
+    The wait doubles from the fast cadence up to RETRY_BACKOFF_MAX. After
+    POLL_RETRY_LIMIT failures the circuit opens and only an occasional
+    probe is made. Jitter keeps chlorinators that share a proxy from
+    retrying in lockstep.
+    """
+    if failures >= POLL_RETRY_LIMIT:
+        seconds = CIRCUIT_OPEN_INTERVAL
+    else:
+        seconds = min(POLL_INTERVAL_FAST * 2 ** (failures - 1), RETRY_BACKOFF_MAX)
+    jitter = random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER)
+    return timedelta(seconds=seconds * jitter)
+
+
+def read_plan(supported: frozenset[int], slow_due: bool) -> set[int]:
+    """Return the characteristics the next poll should read.
+
+    Only characteristics the device delivered in its full gather are asked
+    for, so a model without e.g. a heater does not stall the read.
+    """
+    plan = FAST_READS | SLOW_READS if slow_due else FAST_READS
+    return set(plan & supported)
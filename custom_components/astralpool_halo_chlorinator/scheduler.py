@@ -0,0 +1,43 @@
+"""Serialise BLE sessions to chlorinators that share a Bluetooth adapter."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import logging
+import time
+
+from .const import ADAPTER_STAGGER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BluetoothScheduler:
+    """Hand out one BLE session slot per adapter or proxy at a time.
+
+    Connects through the same adapter starve each other, so sessions on one
+    adapter run one after another with a short gap between them. Sessions on
+    different adapters still run in parallel. Back to back sessions of the
+    same chlorinator skip the gap.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the scheduler."""
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._released: dict[str, tuple[str, float]] = {}
+
+    @asynccontextmanager
+    async def async_slot(self, source: str, address: str) -> AsyncIterator[None]:
+        """Hold the adapter's slot for the duration of a BLE session."""
+        lock = self._locks.setdefault(source, asyncio.Lock())
+        if lock.locked():
+            _LOGGER.debug("%s waiting for adapter %s", address, source)
+        async with lock:
+            last_address, released = self._released.get(source, (address, 0.0))
+            wait = released + ADAPTER_STAGGER - time.monotonic()
+            if wait > 0 and last_address != address:
+                await asyncio.sleep(wait)
+            try:
+                yield
+            finally:
+                self._released[source] = (address, time.monotonic())
@@ -2,26 +2,150 @@
 
 from __future__ import annotations
 
-import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
+from enum import Enum
 import logging
+from typing import Any
 
 from pychlorinator import halo_parsers
 
 from homeassistant import config_entries
-from homeassistant.components.select import SelectEntity
+from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.components.switch import SwitchDeviceClass
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.event import async_call_later
 
-from .const import DOMAIN
+from .const import CONFIRM_TIMEOUT, DOMAIN
 from .coordinator import ChlorinatorDataUpdateCoordinator
+from .entity import (
+    CapabilityTable,
+    ChlorinatorEntity,
+    async_setup_capability_entities,
+)
 from .models import ChlorinatorData
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class ChlorinatorSelectEntityDescription(SelectEntityDescription):
+    """Describes a select by its lookup tables.
+
+    states maps the values of data_keys, as a tuple, to the option shown and
+    actions maps each option to the action that selects it. The options are
+    the keys of actions. zone addresses a lighting zone, counted from 0.
+    """
+
+    data_keys: tuple[str, ...]
+    states: Mapping[tuple[Any, ...], str]
+    actions: Mapping[str, Enum]
+    zone: int | None = None
+
+    def option(self, data: Mapping[str, Any]) -> str | None:
+        """Return the option data shows."""
+        return self.states.get(tuple(data.get(key) for key in self.data_keys))
+
+
+Mode = halo_parsers.Mode
+SpeedLevels = halo_parsers.EquipmentParameterCharacteristic.SpeedLevels
+HeaterModeValues = halo_parsers.HeaterStateCharacteristic.HeaterModeValues
+
+# Off and Auto show whatever speed the pump was last set to
+CHLORINATOR_STATES: dict[tuple[Any, ...], str] = {
+    (mode, speed): option
+    for mode, option in ((Mode.Off, "Off"), (Mode.Auto, "Auto"))
+    for speed in (*SpeedLevels, None)
+} | {
+    (Mode.On, SpeedLevels.Low): "Low",
+    (Mode.On, SpeedLevels.Medium): "Medium",
+    (Mode.On, SpeedLevels.High): "High",
+}
+MODE_STATES: dict[tuple[Any, ...], str] = {
+    (Mode.Off,): "Off",
+    (Mode.Auto,): "Auto",
+    (Mode.On,): "On",
+}
+
+CHLORINATOR_MODE_SELECT = ChlorinatorSelectEntityDescription(
+    key="mode_select",
+    icon="mdi:power",
+    name="Mode",
+    data_keys=("mode", "pump_speed"),
+    states=CHLORINATOR_STATES,
+    actions={
+        "Off": halo_parsers.ChlorinatorActions.Off,
+        "Auto": halo_parsers.ChlorinatorActions.Auto,
+        "Low": halo_parsers.ChlorinatorActions.Low,
+        "Medium": halo_parsers.ChlorinatorActions.Medium,
+        "High": halo_parsers.ChlorinatorActions.High,
+    },
+)
+
+# The heater has no Auto in pychlorinator yet; it is one entry in each map
+HEATER_MODE_SELECT = ChlorinatorSelectEntityDescription(
+    key="heater_onoff_select",
+    icon="mdi:power",
+    name="Heater Mode",
+    data_keys=("HeaterMode",),
+    states={(HeaterModeValues.Off,): "Off", (HeaterModeValues.On,): "On"},
+    actions={
+        "Off": halo_parsers.HeaterAppActions.HeaterOff,
+        "On": halo_parsers.HeaterAppActions.HeaterOn,
+    },
+)
+
+SOLAR_MODE_SELECT = ChlorinatorSelectEntityDescription(
+    key="solar_onoff_select",
+    icon="mdi:power",
+    name="Solar Mode",
+    data_keys=("SolarMode",),
+    states=MODE_STATES,
+    actions={
+        "Off": halo_parsers.SolarAppActions.Off,
+        "Auto": halo_parsers.SolarAppActions.Auto,
+        "On": halo_parsers.SolarAppActions.On,
+    },
+)
+
+# One per zone the light state characteristic carries
+LIGHTING_MODE_SELECTS = tuple(
+    ChlorinatorSelectEntityDescription(
+        key=f"lightz{zone}_onoff_select",
+        icon="mdi:power",
+        name=f"Light Mode Zone{zone}",
+        device_class=SwitchDeviceClass.SWITCH,
+        data_keys=(f"LightingMode_{zone}",),
+        states=MODE_STATES,
+        actions={
+            "Off": halo_parsers.LightAppActions.TurnOffZone,
+            "Auto": halo_parsers.LightAppActions.SetZoneModeToAuto,
+            "On": halo_parsers.LightAppActions.TurnOnZone,
+        },
+        zone=zone - 1,
+    )
+    for zone in range(1, 5)
+)
+
+
+# Capability -> the entities it brings
+CAPABILITY_SELECTS: CapabilityTable = {
+    "HeaterEnabled": lambda coordinator: [
+        ChlorinatorSelect(coordinator, HEATER_MODE_SELECT)
+    ],
+    "SolarEnabled": lambda coordinator: [
+        ChlorinatorSelect(coordinator, SOLAR_MODE_SELECT)
+    ],
+    "LightingEnabled": lambda coordinator: [
+        ChlorinatorSelect(coordinator, description)
+        for description in LIGHTING_MODE_SELECTS[
+            : max(coordinator.capabilities.get("NumZonesInUse") or 1, 1)
+        ]
+    ],
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: config_entries.ConfigEntry,
@@ -29,292 +153,97 @@ async def async_setup_entry(
 ) -> None:
     """Set up Chlorinator from a config entry."""
     data: ChlorinatorData = hass.data[DOMAIN][entry.entry_id]
-    coordinator = data.coordinator
     entities = [
-        ChlorinatorModeSelect(data.coordinator),
+        ChlorinatorSelect(data.coordinator, CHLORINATOR_MODE_SELECT),
     ]
+    async_setup_capability_entities(
+        data.coordinator, entry, async_add_entities, entities, CAPABILITY_SELECTS
+    )
 
-    async def add_dynamic_select_entities(device_type):
-        new_entities = []
-
-        if device_type == "HeaterEnabled" and not hasattr(
-            coordinator, "heater_mode_select_added"
-        ):
-            new_entities.append(HeaterModeSelect(coordinator))
-            coordinator.heater_mode_select_added = True  # Prevents re-adding
-
-        if device_type == "SolarEnabled" and not hasattr(
-            coordinator, "solar_mode_select_added"
-        ):
-            new_entities.append(SolarModeSelect(coordinator))
-            coordinator.solar_mode_select_added = True  # Prevents re-adding
-
-        if device_type == "LightingEnabled" and not hasattr(
-            coordinator, "lighting_mode_select_added"
-        ):
-            new_entities.append(LightingModeSelect(coordinator))
-            coordinator.lighting_mode_select_added = True  # Prevents re-adding
-
-        if new_entities:
-            async_add_entities(new_entities)
-
-    # Assign the dynamic entity adder to the coordinator for easy access
-    coordinator.add_dynamic_select_entities = add_dynamic_select_entities
-
-    # Initial refresh to ensure current state is up to date
-    await coordinator.async_config_entry_first_refresh()
-
-    async_add_entities(entities)
-
-
-class ChlorinatorModeSelect(
-    CoordinatorEntity[ChlorinatorDataUpdateCoordinator], SelectEntity
-):
-    """Representation of a Clorinator Select entity."""
-
-    _attr_icon = "mdi:power"
-    _attr_options = ["Off", "Auto", "Low", "Medium", "High"]
-    _attr_name = "Mode"
-    _attr_unique_id = "HCHLOR_mode_select"
-
-    def __init__(
-        self,
-        coordinator: ChlorinatorDataUpdateCoordinator,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        return {
-            "identifiers": {(DOMAIN, "HCHLOR")},
-            "name": "HCHLOR",
-            "model": "Halo Chlor",
-            "manufacturer": "Astral Pool",
-        }
-
-    @property
-    def current_option(self):
-        mode = self.coordinator.data.get("mode")
-        speed = self.coordinator.data.get("pump_speed")
-
-        if mode is halo_parsers.Mode.Off:
-            return "Off"
-        elif mode is halo_parsers.Mode.Auto:
-            return "Auto"
-        elif mode is halo_parsers.Mode.On:
-            if speed is halo_parsers.EquipmentParameterCharacteristic.SpeedLevels.Low:
-                return "Low"
-            elif (
-                speed
-                is halo_parsers.EquipmentParameterCharacteristic.SpeedLevels.Medium
-            ):
-                return "Medium"
-            elif (
-                speed is halo_parsers.EquipmentParameterCharacteristic.SpeedLevels.High
-            ):
-                return "High"
-
-    async def async_select_option(self, option: str) -> None:
-        """Change the selected option."""
-        action: halo_parsers.ChlorinatorActions.NoAction
-        if option == "Off":
-            action = halo_parsers.ChlorinatorActions.Off
-        elif option == "Auto":
-            action = halo_parsers.ChlorinatorActions.Auto
-        elif option == "Low":
-            action = halo_parsers.ChlorinatorActions.Low
-        elif option == "Medium":
-            action = halo_parsers.ChlorinatorActions.Medium
-        elif option == "High":
-            action = halo_parsers.ChlorinatorActions.High
-        else:
-            action = halo_parsers.ChlorinatorActions.NoAction
-
-        _LOGGER.debug("Select entity state changed to %s", action)
-        await self.coordinator.chlorinator.async_write_action(action)
-        self.coordinator.reset_data_age()
-        await asyncio.sleep(1)
-        await self.coordinator.async_request_refresh()
-
-
-class HeaterModeSelect(
-    CoordinatorEntity[ChlorinatorDataUpdateCoordinator], SelectEntity
-):
-    """Representation of a Clorinator Select entity."""
-
-    _attr_icon = "mdi:power"
-    _attr_options = ["Off", "On"]
-    _attr_name = "Heater Mode"
-    _attr_unique_id = "HCHLOR_heater_onoff_select"
-
-    def __init__(
-        self,
-        coordinator: ChlorinatorDataUpdateCoordinator,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        return {
-            "identifiers": {(DOMAIN, "HCHLOR")},
-            "name": "HCHLOR",
-            "model": "Halo Chlor",
-            "manufacturer": "Astral Pool",
-        }
-
-    @property
-    def current_option(self):
-        mode = self.coordinator.data.get("HeaterMode")
-
-        if mode is halo_parsers.HeaterStateCharacteristic.HeaterModeValues.Off:
-            return "Off"
-        # elif mode is halo_parsers.HeaterStateCharacteristic.HeaterModeValues.Auto:
-        #     return "Auto"
-        elif mode is halo_parsers.HeaterStateCharacteristic.HeaterModeValues.On:
-            return "On"
-
-    async def async_select_option(self, option: str) -> None:
-        """Change the selected option."""
-        action: halo_parsers.HeaterAppActions.NoAction
-        if option == "Off":
-            action = halo_parsers.HeaterAppActions.HeaterOff
-        # elif option == "Auto":
-        #     action = halo_parsers.HeaterAppActions.Auto
-        elif option == "On":
-            action = halo_parsers.HeaterAppActions.HeaterOn
-        else:
-            action = halo_parsers.HeaterAppActions.NoAction
-
-        _LOGGER.debug("Select Heater entity state changed to %s", action)
-        await self.coordinator.chlorinator.async_write_heater_action(action)
-        self.coordinator.reset_data_age()
-        await asyncio.sleep(1)
-        await self.coordinator.async_request_refresh()
-
-
-class SolarModeSelect(
-    CoordinatorEntity[ChlorinatorDataUpdateCoordinator], SelectEntity
-):
-    """Representation of a Clorinator Select entity."""
-
-    _attr_icon = "mdi:power"
-    _attr_options = ["Off", "Auto", "On"]
-    _attr_name = "Solar Mode"
-    _attr_unique_id = "HCHLOR_solar_onoff_select"
-
-    def __init__(
-        self,
-        coordinator: ChlorinatorDataUpdateCoordinator,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        return {
-            "identifiers": {(DOMAIN, "HCHLOR")},
-            "name": "HCHLOR",
-            "model": "Halo Chlor",
-            "manufacturer": "Astral Pool",
-        }
 
-    @property
-    def current_option(self):
-        mode = self.coordinator.data.get("SolarMode")
+class ChlorinatorSelect(ChlorinatorEntity, SelectEntity):
+    """Select that shows a requested option until the device confirms it."""
 
-        if mode is halo_parsers.Mode.Off:
-            return "Off"
-        elif mode is halo_parsers.Mode.Auto:
-            return "Auto"
-        elif mode is halo_parsers.Mode.On:
-            return "On"
-
-    async def async_select_option(self, option: str) -> None:
-        """Change the selected option."""
-        action: halo_parsers.SolarAppActions.NoAction
-        if option == "Off":
-            action = halo_parsers.SolarAppActions.Off
-        elif option == "Auto":
-            action = halo_parsers.SolarAppActions.Auto
-        elif option == "On":
-            action = halo_parsers.SolarAppActions.On
-        else:
-            action = halo_parsers.SolarAppActions.NoAction
-
-        _LOGGER.debug("Select Solar entity state changed to %s", action)
-        await self.coordinator.chlorinator.async_write_solar_action(action)
-        self.coordinator.reset_data_age()
-        await asyncio.sleep(1)
-        await self.coordinator.async_request_refresh()
-
-
-class LightingModeSelect(
-    CoordinatorEntity[ChlorinatorDataUpdateCoordinator], SelectEntity
-):
-    """Representation of a Clorinator Light Select entity."""
-
-    _attr_icon = "mdi:power"
-    _attr_options = ["Off", "Auto", "On"]
-    _attr_name = "Light Mode Zone1"
-    _attr_unique_id = "HCHLOR_lightz1_onoff_select"
-    _attr_device_class = SwitchDeviceClass.SWITCH
+    _attr_has_entity_name = True
+    entity_description: ChlorinatorSelectEntityDescription
+    _optimistic_option: str | None = None
+    _unsub_rollback: CALLBACK_TYPE | None = None
 
     def __init__(
         self,
         coordinator: ChlorinatorDataUpdateCoordinator,
+        description: ChlorinatorSelectEntityDescription,
     ) -> None:
-        """Initialize the sensor."""
+        """Initialize the select."""
         super().__init__(coordinator)
+        self.entity_description = description
+        self._data_keys = description.data_keys
+        self._attr_options = list(description.actions)
+        self._attr_unique_id = f"{coordinator.address}_{description.key}".lower()
 
     @property
-    def device_info(self) -> DeviceInfo | None:
-        return {
-            "identifiers": {(DOMAIN, "HCHLOR")},
-            "name": "HCHLOR",
-            "model": "Halo Chlor",
-            "manufacturer": "Astral Pool",
-        }
+    def device_option(self) -> str | None:
+        """Return the option the chlorinator last reported."""
+        return self.entity_description.option(self.coordinator.data)
 
     @property
     def current_option(self):
-        mode = self.coordinator.data.get("LightingMode_1")
-
-        if mode is halo_parsers.Mode.Off:
-            return "Off"
-        elif mode is halo_parsers.Mode.Auto:
-            return "Auto"
-        elif mode is halo_parsers.Mode.On:
-            return "On"
+        if self._optimistic_option is not None:
+            return self._optimistic_option
+        return self.device_option
 
     async def async_select_option(self, option: str) -> None:
-        """Change the selected option."""
-        action: halo_parsers.LightAppActions.NoAction
-        if option == "Off":
-            action = halo_parsers.LightAppActions.TurnOffZone
-        elif option == "Auto":
-            action = halo_parsers.LightAppActions.SetZoneModeToAuto
-        elif option == "On":
-            action = halo_parsers.LightAppActions.TurnOnZone
-        else:
-            action = halo_parsers.LightAppActions.NoAction
-
-        _LOGGER.debug("Select Light Z1 entity state changed to %s", action)
-        await self.coordinator.chlorinator.async_write_light_action(action)
-        self.coordinator.reset_data_age()
-        await asyncio.sleep(1)
-        await self.coordinator.async_request_refresh()
-
-    @property
-    def is_on(self) -> bool:
-        """Return true if the light is on."""
-        return self.current_option == "On"
-
-    async def async_turn_on(self, **kwargs):
-        """Turn the light on."""
-        await self.async_select_option("On")
-
-    async def async_turn_off(self, **kwargs):
-        """Turn the light off."""
-        await self.async_select_option("Off")
+        """Show option straight away and write the action behind it."""
+        action = self.entity_description.actions[option]
+        _LOGGER.debug("%s changed to %s", self.name, action)
+        self._async_clear_optimistic()
+        self._optimistic_option = option
+        self._unsub_rollback = async_call_later(
+            self.hass, CONFIRM_TIMEOUT, self._async_rollback
+        )
+        self.async_write_ha_state()
+        try:
+            await self.coordinator.async_write_action(
+                action, self.entity_description.zone
+            )
+        except Exception:
+            self._async_clear_optimistic()
+            self.async_write_ha_state()
+            raise
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop a pending rollback."""
+        self._async_clear_optimistic()
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _async_rollback(self, _now=None) -> None:
+        """Fall back to the reported option if the change never showed up."""
+        _LOGGER.warning(
+            "%s did not confirm %s, showing %s",
+            self.name,
+            self._optimistic_option,
+            self.device_option,
+        )
+        self._unsub_rollback = None
+        self._async_clear_optimistic()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_clear_optimistic(self) -> None:
+        self._optimistic_option = None
+        if self._unsub_rollback is not None:
+            self._unsub_rollback()
+            self._unsub_rollback = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Confirm a requested option once the device reports it."""
+        if (
+            self._optimistic_option is not None
+            and self.device_option == self._optimistic_option
+        ):
+            self._async_clear_optimistic()
+            self.async_write_ha_state()
+            return
+        super()._handle_coordinator_update()
@@ -12,13 +12,23 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import (
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    UnitOfTime,
+    UnitOfVolumeFlowRate,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import ChlorinatorDataUpdateCoordinator
+from .entity import (
+    CapabilityTable,
+    ChlorinatorEntity,
+    async_setup_capability_entities,
+)
+from .metrics import TimingStats
 from .models import ChlorinatorData
 
 _LOGGER = logging.getLogger(__name__)
@@ -104,6 +114,73 @@ CHLORINATOR_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
+    "ph_mean": SensorEntityDescription(
+        key="ph_mean",
+        icon="mdi:ph",
+        name="pH average",
+        device_class=SensorDeviceClass.PH,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+    ),
+    "ph_drift": SensorEntityDescription(
+        key="ph_drift",
+        icon="mdi:chart-line",
+        name="pH drift",
+        native_unit_of_measurement="pH/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+    ),
+    "ph_stddev": SensorEntityDescription(
+        key="ph_stddev",
+        icon="mdi:chart-bell-curve",
+        name="pH variability",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "ph_out_of_band": SensorEntityDescription(
+        key="ph_out_of_band",
+        icon="mdi:timer-alert-outline",
+        name="pH time out of band",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "orp_mean": SensorEntityDescription(
+        key="orp_mean",
+        icon="mdi:beaker-check-outline",
+        name="ORP average",
+        native_unit_of_measurement="mV",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "orp_deviation": SensorEntityDescription(
+        key="orp_deviation",
+        icon="mdi:chart-line",
+        name="ORP deviation from setpoint",
+        native_unit_of_measurement="mV",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "orp_stddev": SensorEntityDescription(
+        key="orp_stddev",
+        icon="mdi:chart-bell-curve",
+        name="ORP variability",
+        native_unit_of_measurement="mV",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "orp_out_of_band": SensorEntityDescription(
+        key="orp_out_of_band",
+        icon="mdi:timer-alert-outline",
+        name="ORP time out of band",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
     "ph_control_type": SensorEntityDescription(
         key="ph_control_type",
         icon="mdi:ph",
@@ -129,13 +206,74 @@ CHLORINATOR_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
+    "filter_flow_rate": SensorEntityDescription(
+        key="filter_flow_rate",
+        icon="mdi:pump",
+        name="Filtration flow",
+        native_unit_of_measurement=UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
+        device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "filter_time_to_target": SensorEntityDescription(
+        key="filter_time_to_target",
+        icon="mdi:timer-sand",
+        name="Filtration time to target",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        suggested_display_precision=1,
+    ),
+    "filter_filtered_today": SensorEntityDescription(
+        key="filter_filtered_today",
+        icon="mdi:water-sync",
+        name="Litres filtered today",
+        native_unit_of_measurement="L",
+        device_class=SensorDeviceClass.VOLUME,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    "filter_turnover_today": SensorEntityDescription(
+        key="filter_turnover_today",
+        icon="mdi:water-sync",
+        name="Turnover today",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "filter_target_met": SensorEntityDescription(
+        key="filter_target_met",
+        icon="mdi:check-circle-outline",
+        name="Filtration target met",
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
     "DosingPumpSecs": SensorEntityDescription(
         key="DosingPumpSecs",
         icon="mdi:chart-line",
         name="Dosing Pump today (ml)",
         native_unit_of_measurement="mL",
         device_class=SensorDeviceClass.VOLUME,
-        state_class=SensorStateClass.TOTAL,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    "dosing_total": SensorEntityDescription(
+        key="dosing_total",
+        icon="mdi:beaker-outline",
+        name="Acid dosed",
+        native_unit_of_measurement="mL",
+        device_class=SensorDeviceClass.VOLUME,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    "dosing_yesterday": SensorEntityDescription(
+        key="dosing_yesterday",
+        icon="mdi:beaker-outline",
+        name="Acid dosed yesterday",
+        native_unit_of_measurement="mL",
+        device_class=SensorDeviceClass.VOLUME,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    "dosing_week": SensorEntityDescription(
+        key="dosing_week",
+        icon="mdi:beaker-outline",
+        name="Acid dosed last 7 days",
+        native_unit_of_measurement="mL",
+        device_class=SensorDeviceClass.VOLUME,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
     "WaterTemp": SensorEntityDescription(
@@ -164,6 +302,42 @@ CHLORINATOR_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
+    "cell_amp_hours": SensorEntityDescription(
+        key="cell_amp_hours",
+        icon="mdi:fuel-cell",
+        name="Cell charge delivered",
+        native_unit_of_measurement="Ah",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    "cell_runtime_today": SensorEntityDescription(
+        key="cell_runtime_today",
+        icon="mdi:fuel-cell",
+        name="Cell running time today",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    "cell_life_used": SensorEntityDescription(
+        key="cell_life_used",
+        icon="mdi:fuel-cell",
+        name="Cell life used",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    "cell_life_remaining": SensorEntityDescription(
+        key="cell_life_remaining",
+        icon="mdi:calendar-clock",
+        name="Cell life remaining",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
     "PreviousDaysCellLoad": SensorEntityDescription(
         key="PreviousDaysCellLoad",
         icon="mdi:fuel-cell",
@@ -212,6 +386,99 @@ SOLAR_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
     ),
 }
 
+# Refresh health, keyed by ChlorinatorMetrics attribute. Timings show their
+# rolling median, with last, p50 and p95 as attributes.
+METRIC_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
+    "slot_wait": SensorEntityDescription(
+        key="slot_wait",
+        icon="mdi:timer-sand",
+        name="Adapter wait time",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "connect": SensorEntityDescription(
+        key="connect",
+        icon="mdi:bluetooth-connect",
+        name="Connect time",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "gather": SensorEntityDescription(
+        key="gather",
+        icon="mdi:timer-outline",
+        name="Read time",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "confirm": SensorEntityDescription(
+        key="confirm",
+        icon="mdi:timer-check-outline",
+        name="Write to confirm time",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "rssi": SensorEntityDescription(
+        key="rssi",
+        name="Signal strength",
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "retries": SensorEntityDescription(
+        key="retries",
+        icon="mdi:restart",
+        name="Failed polls",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "consecutive_failures": SensorEntityDescription(
+        key="consecutive_failures",
+        icon="mdi:alert-circle-outline",
+        name="Consecutive failed polls",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "last_success": SensorEntityDescription(
+        key="last_success",
+        icon="mdi:clock-check-outline",
+        name="Last successful poll",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+}
+
+
+# Capability -> the entities it brings
+CAPABILITY_SENSORS: CapabilityTable = {
+    "SolarEnabled": lambda coordinator: [
+        HeaterSensor(coordinator, desc) for desc in SOLAR_SENSOR_TYPES.values()
+    ],
+    "HeaterEnabled": lambda coordinator: [
+        HeaterSensor(coordinator, desc) for desc in HEATER_SENSOR_TYPES.values()
+    ],
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -220,38 +487,19 @@ async def async_setup_entry(
 ) -> None:
     """Set up Chlorinator from a config entry."""
     data: ChlorinatorData = hass.data[DOMAIN][entry.entry_id]
-    coordinator = data.coordinator
-
-    async def add_sensor_callback(sensor_type):
-        sensor_types_dict = {
-            "SolarEnabled": SOLAR_SENSOR_TYPES,
-            "HeaterEnabled": HEATER_SENSOR_TYPES,
-        }
-        sensor_descs = sensor_types_dict.get(sensor_type, {})
-
-        new_entities = []
-        for sensor_type, sensor_desc in sensor_descs.items():
-            unique_id = f"hchlor_{sensor_type}".lower()
-            if unique_id not in coordinator.added_entities:
-                new_entities.append(HeaterSensor(coordinator, sensor_desc))
-                coordinator.added_entities.add(unique_id)
-
-        if new_entities:
-            async_add_entities(new_entities)
-
-    coordinator.add_sensor_callback = add_sensor_callback
-    await coordinator.async_config_entry_first_refresh()
-
     entities = [
         ChlorinatorSensor(data.coordinator, sensor_desc)
         for sensor_desc in CHLORINATOR_SENSOR_TYPES
     ]
-    async_add_entities(entities)
+    entities.extend(
+        MetricSensor(data.coordinator, desc) for desc in METRIC_SENSOR_TYPES.values()
+    )
+    async_setup_capability_entities(
+        data.coordinator, entry, async_add_entities, entities, CAPABILITY_SENSORS
+    )
 
 
-class ChlorinatorSensor(
-    CoordinatorEntity[ChlorinatorDataUpdateCoordinator], SensorEntity
-):
+class ChlorinatorSensor(ChlorinatorEntity, SensorEntity):
     """Representation of a Clorinator Sensor."""
 
     _attr_has_entity_name = True
@@ -265,50 +513,85 @@ class ChlorinatorSensor(
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._sensor = sensor
-        self._attr_unique_id = f"HCHLOR_{sensor}".lower()
+        self._data_keys = (sensor,)
+        if (source := coordinator.derived_sources.get(sensor)) is not None:
+            # Goes stale along with the reading it is derived from
+            self._data_keys += (source,)
+        self._attr_unique_id = f"{coordinator.address}_{sensor}".lower()
         self._attr_name = CHLORINATOR_SENSOR_TYPES[sensor].name
         self.entity_description = CHLORINATOR_SENSOR_TYPES[sensor]
         self._attr_native_unit_of_measurement = CHLORINATOR_SENSOR_TYPES[
             sensor
         ].native_unit_of_measurement
 
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        return {
-            "identifiers": {(DOMAIN, "HCHLOR")},
-            "name": "HCHLOR",
-            "model": "Halo Chlor",
-            "manufacturer": "Astral Pool",
-        }
-
     @property
     def native_value(self):
         return self.coordinator.data.get(self._sensor)
 
 
-class HeaterSensor(CoordinatorEntity[ChlorinatorDataUpdateCoordinator], SensorEntity):
+class HeaterSensor(ChlorinatorEntity, SensorEntity):
     """Representation of a Heater Sensor."""
 
+    _attr_has_entity_name = True
+
     def __init__(self, coordinator, sensor_desc: SensorEntityDescription) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._sensor = sensor_desc.key
-        self._attr_unique_id = f"hchlor_{self._sensor}".lower()
+        self._data_keys = (self._sensor,)
+        self._attr_unique_id = f"{coordinator.address}_{self._sensor}".lower()
         self.entity_description = sensor_desc
         self._attr_name = sensor_desc.name
         self._attr_native_unit_of_measurement = sensor_desc.native_unit_of_measurement
 
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        # Device info remains the same
-        return {
-            "identifiers": {(DOMAIN, "HCHLOR")},
-            "name": "HCHLOR",
-            "model": "Halo Chlor",
-            "manufacturer": "Astral Pool",
-        }
-
     @property
     def native_value(self):
         # Use self._sensor to fetch the relevant data from coordinator
         return self.coordinator.data.get(self._sensor)
+
+
+class MetricSensor(CoordinatorEntity[ChlorinatorDataUpdateCoordinator], SensorEntity):
+    """Diagnostic sensor showing how the last refreshes went."""
+
+    _attr_has_entity_name = True
+    entity_description: SensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ChlorinatorDataUpdateCoordinator,
+        sensor_desc: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = sensor_desc
+        self._attr_device_info = coordinator.device_info
+        self._attr_unique_id = f"{coordinator.address}_{sensor_desc.key}".lower()
+        self._written: tuple | None = None
+
+    @property
+    def available(self) -> bool:
+        # Most useful exactly when polls fail
+        return True
+
+    @property
+    def native_value(self):
+        value = getattr(self.coordinator.metrics, self.entity_description.key)
+        if isinstance(value, TimingStats):
+            return value.percentile(50)
+        return value
+
+    @property
+    def extra_state_attributes(self):
+        value = getattr(self.coordinator.metrics, self.entity_description.key)
+        if isinstance(value, TimingStats):
+            return value.as_dict()
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write when the metric moved."""
+        written = (self.native_value, self.extra_state_attributes)
+        if written == self._written:
+            return
+        self._written = written
+        super()._handle_coordinator_update()
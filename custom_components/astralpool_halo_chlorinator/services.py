@@ -0,0 +1,244 @@
+"""Services that act on several functions of a chlorinator at once."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from bleak.exc import BleakError
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import DOMAIN
+from .coordinator import ChlorinatorDataUpdateCoordinator
+from .models import ChlorinatorData
+from .polling import READ_GROUPS
+from .select import (
+    CHLORINATOR_MODE_SELECT,
+    HEATER_MODE_SELECT,
+    LIGHTING_MODE_SELECTS,
+    SOLAR_MODE_SELECT,
+    ChlorinatorSelectEntityDescription,
+)
+from .session import CHARACTERISTICS, SessionError
+
+ATTR_DEVICE_ID = "device_id"
+ATTR_GROUPS = "groups"
+
+SERVICE_SET_MODES = "set_modes"
+SERVICE_REFRESH_NOW = "refresh_now"
+SERVICE_GATHER_RAW = "gather_raw"
+
+# set_modes field -> the select whose options and actions it takes
+MODE_FIELDS: dict[str, ChlorinatorSelectEntityDescription] = {
+    "mode": CHLORINATOR_MODE_SELECT,
+    "heater": HEATER_MODE_SELECT,
+    "solar": SOLAR_MODE_SELECT,
+} | {
+    f"light_zone_{description.zone + 1}": description
+    for description in LIGHTING_MODE_SELECTS
+}
+
+DEVICES_SCHEMA = {vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string])}
+SET_MODES_SCHEMA = vol.Schema(
+    {
+        **DEVICES_SCHEMA,
+        **{
+            vol.Optional(field): vol.In(list(description.actions))
+            for field, description in MODE_FIELDS.items()
+        },
+    }
+)
+REFRESH_NOW_SCHEMA = vol.Schema(
+    {
+        **DEVICES_SCHEMA,
+        vol.Optional(ATTR_GROUPS): vol.All(cv.ensure_list, [vol.In(READ_GROUPS)]),
+    }
+)
+GATHER_RAW_SCHEMA = vol.Schema(DEVICES_SCHEMA)
+
+
+def response_value(value: Any) -> Any:
+    """Turn a decoded value into something a service response can hold."""
+    if isinstance(value, Enum):
+        return value.name if value.name is not None else value.value
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).hex()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [response_value(item) for item in value]
+    return value
+
+
+def _supported(coordinator: ChlorinatorDataUpdateCoordinator, field: str) -> bool:
+    """Return whether the chlorinator has the equipment a set_modes field sets."""
+    capabilities = coordinator.capabilities
+    if field == "heater":
+        return bool(capabilities.get("HeaterEnabled"))
+    if field == "solar":
+        return bool(capabilities.get("SolarEnabled"))
+    if (zone := MODE_FIELDS[field].zone) is not None:
+        return bool(capabilities.get("LightingEnabled")) and zone < max(
+            capabilities.get("NumZonesInUse") or 1, 1
+        )
+    return True
+
+
+def _coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[str, ChlorinatorDataUpdateCoordinator]:
+    """Return the coordinator behind each device the call targets."""
+    device_registry = dr.async_get(hass)
+    entries: dict[str, ChlorinatorData] = hass.data.get(DOMAIN, {})
+    coordinators = {}
+    for device_id in call.data[ATTR_DEVICE_ID]:
+        device = device_registry.async_get(device_id)
+        entry_ids = device.config_entries & entries.keys() if device else set()
+        if not entry_ids:
+            raise ServiceValidationError(f"{device_id} is not a loaded chlorinator")
+        coordinators[device_id] = entries[next(iter(entry_ids))].coordinator
+    return coordinators
+
+
+async def _async_for_each_device(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    handler: Callable[[ChlorinatorDataUpdateCoordinator], Awaitable[dict[str, Any]]],
+) -> ServiceResponse:
+    """Run handler for every targeted device at once; key results by device.
+
+    The devices still take turns on an adapter they share.
+    """
+    coordinators = _coordinators(hass, call)
+    results = await asyncio.gather(
+        *(handler(coordinator) for coordinator in coordinators.values()),
+        return_exceptions=True,
+    )
+    response: dict[str, Any] = {}
+    for (device_id, coordinator), result in zip(coordinators.items(), results):
+        if isinstance(
+            result, (BleakError, SessionError, UpdateFailed, asyncio.TimeoutError)
+        ):
+            raise HomeAssistantError(
+                f"Could not reach {coordinator.address}: {result}"
+            ) from result
+        if isinstance(result, BaseException):
+            raise result
+        response[device_id] = result
+    return response
+
+
+async def async_set_modes(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Write every requested mode in one batch and return what was read back."""
+    fields = {field: call.data[field] for field in MODE_FIELDS if field in call.data}
+    if not fields:
+        raise ServiceValidationError("No mode to set")
+    # Checked for every device before any of them is written to
+    for coordinator in _coordinators(hass, call).values():
+        if unsupported := [
+            field for field in fields if not _supported(coordinator, field)
+        ]:
+            raise ServiceValidationError(
+                f"{coordinator.address} has no {', '.join(unsupported)}"
+            )
+
+    async def set_modes(coordinator: ChlorinatorDataUpdateCoordinator):
+        # Submitted together, so they are written in one session
+        await asyncio.gather(
+            *(
+                coordinator.async_write_action(
+                    MODE_FIELDS[field].actions[option],
+                    MODE_FIELDS[field].zone,
+                    confirmed=True,
+                )
+                for field, option in fields.items()
+            )
+        )
+        data = coordinator.data or {}
+        return {field: MODE_FIELDS[field].option(data) for field in fields}
+
+    return await _async_for_each_device(hass, call, set_modes)
+
+
+async def async_refresh_now(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Read the requested groups, or everything, and return the values read."""
+    groups = call.data.get(ATTR_GROUPS)
+
+    async def refresh_now(coordinator: ChlorinatorDataUpdateCoordinator):
+        cmd_types = None
+        if groups and coordinator.session is not None:
+            cmd_types = frozenset().union(*(READ_GROUPS[group] for group in groups))
+        decoded = await coordinator.async_read_now(cmd_types)
+        return {key: response_value(value) for key, value in decoded.items()}
+
+    return await _async_for_each_device(hass, call, refresh_now)
+
+
+async def async_gather_raw(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Read everything and return each characteristic's payload and values."""
+
+    async def gather_raw(coordinator: ChlorinatorDataUpdateCoordinator):
+        if (session := coordinator.session) is None:
+            raise ServiceValidationError(f"{coordinator.address} is not a Halo")
+        decoded = await coordinator.async_read_now()
+        characteristics: dict[str, Any] = {
+            str(cmd_type): {
+                "characteristic": getattr(
+                    CHARACTERISTICS.get(cmd_type), "__name__", None
+                ),
+                "payload": session.frames[cmd_type].hex(),
+                "values": {},
+            }
+            for cmd_type in sorted(session.received)
+            if cmd_type in session.frames
+        }
+        for key, value in decoded.items():
+            if (cmd_type := str(session.key_types.get(key))) in characteristics:
+                characteristics[cmd_type]["values"][key] = response_value(value)
+        return characteristics
+
+    return await _async_for_each_device(hass, call, gather_raw)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+    services: tuple[tuple[str, Any, vol.Schema, SupportsResponse], ...] = (
+        (
+            SERVICE_SET_MODES,
+            async_set_modes,
+            SET_MODES_SCHEMA,
+            SupportsResponse.OPTIONAL,
+        ),
+        (
+            SERVICE_REFRESH_NOW,
+            async_refresh_now,
+            REFRESH_NOW_SCHEMA,
+            SupportsResponse.OPTIONAL,
+        ),
+        (
+            SERVICE_GATHER_RAW,
+            async_gather_raw,
+            GATHER_RAW_SCHEMA,
+            SupportsResponse.ONLY,
+        ),
+    )
+    for service, handler, schema, supports_response in services:
+
+        async def async_handle(call: ServiceCall, handler=handler) -> ServiceResponse:
+            return await handler(hass, call)
+
+        hass.services.async_register(
+            DOMAIN, service, async_handle, schema, supports_response
+        )
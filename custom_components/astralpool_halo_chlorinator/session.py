@@ -0,0 +1,383 @@
+"""Long lived BLE session to a Halo chlorinator."""
+from __future__ import annotations
+
+import asyncio
+import binascii
+from collections.abc import Iterable
+from contextlib import AbstractAsyncContextManager, nullcontext
+import logging
+import time
+from typing import Any, Callable
+
+from bleak.backends.device import BLEDevice
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
+from pychlorinator import halo_parsers
+from pychlorinator.halochlorinator import (
+    UUID_MASTER_AUTHENTICATION_2,
+    UUID_RX_CHARACTERISTIC,
+    UUID_SLAVE_SESSION_KEY_2,
+    UUID_TX_CHARACTERISTIC,
+    decrypt_characteristic,
+    encrypt_characteristic,
+    encrypt_mac_key,
+    pad_byte_array,
+)
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    GATHER_QUIET_TIME,
+    GATHER_TIMEOUT,
+    KEEPALIVE_INTERVAL,
+    READ_TIMEOUT,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MIN,
+)
+from .metrics import TimingStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# Same decoder table pychlorinator uses for its connect-per-poll gather.
+CHARACTERISTICS: dict[int, type] = {
+    1: halo_parsers.DeviceProfileCharacteristic2,
+    9: halo_parsers.TempCharacteristic,
+    100: halo_parsers.SettingsCharacteristic2,
+    101: halo_parsers.WaterVolumeCharacteristic,
+    102: halo_parsers.SetPointCharacteristic,
+    104: halo_parsers.StateCharacteristic3,
+    105: halo_parsers.CapabilitiesCharacteristic2,
+    106: halo_parsers.MaintenanceStateCharacteristic,
+    201: halo_parsers.EquipmentModeCharacteristic,
+    202: halo_parsers.EquipmentParameterCharacteristic,
+    206: halo_parsers.EquipmentModeStateCharacteristicV2,
+    300: halo_parsers.LightStateCharacteristic,
+    301: halo_parsers.LightCapabilitiesCharacteristic,
+    302: halo_parsers.LightSetupCharacteristic,
+    600: halo_parsers.ProbeCharacteristic,
+    601: halo_parsers.CellCharacteristic2,
+    602: halo_parsers.PowerBoardCharacteristic,
+    1100: halo_parsers.HeaterCapabilitiesCharacteristic,
+    1101: halo_parsers.HeaterConfigCharacteristic,
+    1102: halo_parsers.HeaterStateCharacteristic,
+    1104: halo_parsers.HeaterCooldownStateCharacteristic,
+    1200: halo_parsers.SolarCapabilitiesCharacteristic,
+    1201: halo_parsers.SolarConfigCharacteristic,
+    1202: halo_parsers.SolarStateCharacteristic,
+    1300: halo_parsers.GPOSetupCharacteristic,
+    1301: halo_parsers.RelaySetupCharacteristic,
+    1302: halo_parsers.ValveSetupCharacteristic,
+}
+
+# ReadForCatchAll requests sent by a full gather, in the order the app uses.
+GATHER_REQUESTS = (107, 5, 600, 601, 602, 603)
+KEEPALIVE_REQUEST = 1
+
+
+def read_request(cmd_type: int) -> bytes:
+    """Build the plain ReadForCatchAll frame for a characteristic."""
+    return pad_byte_array(bytes([2]) + cmd_type.to_bytes(2, byteorder="little"), 20)
+
+
+def decode_frame(data: bytes, session_key: bytes) -> tuple[int, bytes, dict[str, Any]]:
+    """Decrypt a notification frame and decode it if the type is known.
+
+    Returns the command type, the raw payload and the decoded values.
+    """
+    decrypted = decrypt_characteristic(data, session_key)
+    cmd_type = int.from_bytes(decrypted[1:3], byteorder="little")
+    cmd_data = decrypted[3:20]
+    _LOGGER.debug("CMD: %s DATA: %s", cmd_type, binascii.hexlify(cmd_data))
+    if (characteristic_class := CHARACTERISTICS.get(cmd_type)) is None:
+        return cmd_type, cmd_data, {}
+    return cmd_type, cmd_data, vars(characteristic_class(cmd_data))
+
+
+class SessionError(Exception):
+    """Raised when the session cannot reach the chlorinator."""
+
+
+class HaloSession:
+    """Authenticated BLE link kept open across polls.
+
+    The link is opened lazily, kept alive while in use and released once it
+    has been idle for ``idle_timeout`` seconds. Failed connects back off
+    exponentially so an unreachable device is not hammered.
+
+    With a push listener set the link is held regardless of use, re-opened
+    after a drop and every decoded frame the session did not ask for is
+    handed to the listener. Replies to gathers, reads and keep alives are
+    not, as their callers publish them or they carry nothing new.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        ble_device: BLEDevice | None,
+        access_code: str,
+        idle_timeout: float,
+    ) -> None:
+        """Initialise the session; ble_device may follow once it is seen."""
+        self.hass = hass
+        self._address = address
+        self._ble_device = ble_device
+        self._access_code = access_code
+        self._idle_timeout = idle_timeout
+        self._client: BleakClientWithServiceCache | None = None
+        self._session_key: bytes | None = None
+        self._lock = asyncio.Lock()
+        self._result: dict[str, Any] = {}
+        self._received: set[int] = set()
+        self.key_types: dict[str, int] = {}
+        # Last raw payload of each characteristic, for gather_raw
+        self.frames: dict[int, bytes] = {}
+        self._frame_event = asyncio.Event()
+        self._last_used = 0.0
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+        self._keepalive_task: asyncio.Task | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._listener: Callable[[dict[str, Any]], None] | None = None
+        self._slot: Callable[[], AbstractAsyncContextManager[None]] | None = None
+        self._keepalive_pending = False
+        self.connect_time = TimingStats()
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True while the link is up and authenticated."""
+        return (
+            self._client is not None
+            and self._client.is_connected
+            and self._session_key is not None
+        )
+
+    @property
+    def received(self) -> frozenset[int]:
+        """Return the characteristics the last gather or read delivered."""
+        return frozenset(self._received)
+
+    def set_ble_device(self, ble_device: BLEDevice) -> None:
+        """Use a fresher BLEDevice (e.g. via another proxy) on the next connect."""
+        self._ble_device = ble_device
+
+    def set_push_listener(
+        self,
+        listener: Callable[[dict[str, Any]], None] | None,
+        slot: Callable[[], AbstractAsyncContextManager[None]] | None = None,
+    ) -> None:
+        """Forward decoded frames to listener and hold the link while set.
+
+        Reconnects after a drop are made while holding slot(), so they take
+        their turn on the adapter like any other connect.
+        """
+        self._listener = listener
+        self._slot = slot
+
+    async def async_gatherdata(self) -> dict[str, Any]:
+        """Request a full read and collect frames until no new ones arrive."""
+        async with self._lock:
+            await self._async_ensure_connected()
+            self._result = {}
+            self._received = set()
+            self._frame_event.clear()
+            for cmd_type in GATHER_REQUESTS:
+                await self._async_write_plain(read_request(cmd_type))
+            await self._async_wait_for_quiet()
+            self._touch()
+            _LOGGER.debug("halo session gather finished: %s", self._result)
+            return self._result
+
+    async def async_read(self, cmd_types: Iterable[int]) -> dict[str, Any]:
+        """Read just the given characteristics, e.g. to confirm an action."""
+        wanted = set(cmd_types)
+        async with self._lock:
+            await self._async_ensure_connected()
+            self._result = {}
+            self._received = set()
+            self._frame_event.clear()
+            for cmd_type in sorted(wanted):
+                await self._async_write_plain(read_request(cmd_type))
+            await self._async_wait_for_frames(wanted)
+            self._touch()
+            return self._result
+
+    async def async_write(self, *frames: bytes) -> None:
+        """Write already packed action frames over the session."""
+        async with self._lock:
+            await self._async_ensure_connected()
+            for data in frames:
+                _LOGGER.debug("Data to write %s", data.hex())
+                await self._async_write_plain(data)
+            self._touch()
+
+    async def async_close(self) -> None:
+        """Stop pushing and release the link for good."""
+        self._listener = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        await self.async_disconnect()
+
+    async def async_disconnect(self) -> None:
+        """Release the link."""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        client, self._client = self._client, None
+        self._session_key = None
+        if client is not None and client.is_connected:
+            _LOGGER.debug("Releasing halo session to %s", self._address)
+            await client.disconnect()
+
+    def _touch(self) -> None:
+        self._last_used = time.monotonic()
+
+    async def _async_ensure_connected(self) -> None:
+        """Connect and authenticate unless the link is already up."""
+        if self.is_connected:
+            return
+        if self._ble_device is None:
+            raise SessionError(f"{self._address} has not been seen yet")
+        now = time.monotonic()
+        if now < self._next_attempt:
+            raise SessionError(
+                f"Reconnect backing off for {self._next_attempt - now:.0f}s"
+            )
+        try:
+            await self._async_connect()
+        except Exception as err:
+            self._backoff = min(
+                max(self._backoff * 2, RECONNECT_BACKOFF_MIN), RECONNECT_BACKOFF_MAX
+            )
+            self._next_attempt = time.monotonic() + self._backoff
+            await self.async_disconnect()
+            raise SessionError(f"Could not connect: {err}") from err
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+
+    async def _async_connect(self) -> None:
+        _LOGGER.debug("Opening halo session to %s", self._address)
+        start = time.monotonic()
+        client = await establish_connection(
+            BleakClientWithServiceCache,
+            self._ble_device,
+            self._address,
+            disconnected_callback=self._on_disconnect,
+        )
+        self._client = client
+        session_key = await client.read_gatt_char(UUID_SLAVE_SESSION_KEY_2)
+        _LOGGER.debug("Got session key %s", session_key.hex())
+        mac = encrypt_mac_key(session_key, bytes(self._access_code, "utf_8"))
+        await client.write_gatt_char(UUID_MASTER_AUTHENTICATION_2, mac)
+        self._session_key = session_key
+        await client.start_notify(UUID_TX_CHARACTERISTIC, self._on_notification)
+        self.connect_time.add(time.monotonic() - start)
+        self._touch()
+        self._keepalive_task = self.hass.async_create_background_task(
+            self._async_keepalive(), f"halo session {self._address}"
+        )
+
+    def _on_disconnect(self, client: BleakClientWithServiceCache) -> None:
+        """Forget the link when the device drops it; reconnect on next use."""
+        if client is not self._client:
+            return
+        _LOGGER.debug("Halo session to %s dropped", self._address)
+        self._client = None
+        self._session_key = None
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self._listener is not None and self._reconnect_task is None:
+            self._reconnect_task = self.hass.async_create_background_task(
+                self._async_reconnect(), f"halo reconnect {self._address}"
+            )
+
+    async def _async_reconnect(self) -> None:
+        """Re-open a pushing session, honouring the reconnect back-off."""
+        try:
+            while self._listener is not None and not self.is_connected:
+                await asyncio.sleep(
+                    max(self._next_attempt - time.monotonic(), RECONNECT_BACKOFF_MIN)
+                )
+                try:
+                    async with self._async_slot(), self._lock:
+                        await self._async_ensure_connected()
+                except SessionError as err:
+                    _LOGGER.debug("Push reconnect failed: %s", err)
+        finally:
+            self._reconnect_task = None
+
+    def _async_slot(self) -> AbstractAsyncContextManager[None]:
+        return self._slot() if self._slot is not None else nullcontext()
+
+    def _on_notification(self, _: Any, data: bytearray) -> None:
+        if self._session_key is None:
+            return
+        cmd_type, payload, decoded = decode_frame(bytes(data), self._session_key)
+        if cmd_type not in self._received:
+            # Repeats are pushed changes, not replies, so they must not keep
+            # a gather waiting for the device to go quiet
+            self._received.add(cmd_type)
+            self._frame_event.set()
+        self.frames[cmd_type] = payload
+        self.key_types.update(dict.fromkeys(decoded, cmd_type))
+        self._result.update(decoded)
+        if cmd_type == KEEPALIVE_REQUEST and self._keepalive_pending:
+            self._keepalive_pending = False
+            return
+        if decoded and self._listener is not None and not self._lock.locked():
+            self._listener(decoded)
+
+    async def _async_write_plain(self, data: bytes) -> None:
+        assert self._client is not None and self._session_key is not None
+        await self._client.write_gatt_char(
+            UUID_RX_CHARACTERISTIC, encrypt_characteristic(data, self._session_key)
+        )
+
+    async def _async_wait_for_quiet(self) -> None:
+        """Wait until no new characteristic arrives, bounded by GATHER_TIMEOUT."""
+        deadline = time.monotonic() + GATHER_TIMEOUT
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                await asyncio.wait_for(
+                    self._frame_event.wait(),
+                    min(GATHER_QUIET_TIME if self._result else remaining, remaining),
+                )
+            except asyncio.TimeoutError:
+                if self._result:
+                    return
+                break
+            self._frame_event.clear()
+        if not self._result:
+            raise SessionError("No data received from chlorinator")
+
+    async def _async_wait_for_frames(self, wanted: set[int]) -> None:
+        """Wait until every wanted frame arrived, bounded by READ_TIMEOUT."""
+        try:
+            async with asyncio.timeout(READ_TIMEOUT):
+                while not wanted <= self._received:
+                    await self._frame_event.wait()
+                    self._frame_event.clear()
+        except asyncio.TimeoutError:
+            if not self._result:
+                raise SessionError("No data received from chlorinator") from None
+
+    async def _async_keepalive(self) -> None:
+        """Keep the link open while in use and release it once idle."""
+        while self.is_connected:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            if (
+                self._listener is None
+                and time.monotonic() - self._last_used > self._idle_timeout
+            ):
+                _LOGGER.debug("Halo session idle for %ss", self._idle_timeout)
+                self._keepalive_task = None
+                await self.async_disconnect()
+                return
+            if self._lock.locked() or not self.is_connected:
+                continue
+            try:
+                self._keepalive_pending = True
+                await self._async_write_plain(read_request(KEEPALIVE_REQUEST))
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Keep alive failed: %s", err)
@@ -0,0 +1,168 @@
+"""Import the chlorinator's own counters into long-term statistics."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import PERCENTAGE, UnitOfTime, UnitOfVolume
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .coordinator import ChlorinatorDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lifetime counters kept by the device: (data key, statistic, name, unit)
+COUNTER_STATISTICS = (
+    ("CellRunningTime", "cell_running_time", "Cell running time", UnitOfTime.HOURS),
+    (
+        "LowSaltCellRunningTime",
+        "low_salt_cell_running_time",
+        "Low salt cell running time",
+        UnitOfTime.HOURS,
+    ),
+    ("CellReversalCount", "cell_reversals", "Cell reversals", None),
+)
+# Totals the device keeps for the current day
+TODAY_STATISTICS = (
+    ("DosingPumpSecs", "dosing_daily", "Acid dosed per day", UnitOfVolume.MILLILITERS),
+    (
+        "FilterPumpMins",
+        "filter_pump_daily",
+        "Filter pump running time per day",
+        UnitOfTime.MINUTES,
+    ),
+)
+# Levels sampled once per hour
+HOURLY_STATISTICS = (
+    (
+        "PoolLeftFilter",
+        "pool_left_filter",
+        "Litres left to filter",
+        UnitOfVolume.LITERS,
+    ),
+)
+# Values the device reports for the previous day
+YESTERDAY_STATISTICS = (
+    ("PreviousDaysCellLoad", "cell_load_daily", "Cell load per day", PERCENTAGE),
+)
+
+
+def hour_start(moment: datetime) -> datetime:
+    """Floor moment to the UTC hour statistics are keyed by."""
+    return dt_util.as_utc(moment).replace(minute=0, second=0, microsecond=0)
+
+
+def day_start(moment: datetime) -> datetime:
+    """Return the first whole UTC hour of moment's local day.
+
+    Local midnight is not a whole UTC hour in half-hour offset zones, and
+    flooring it would key the day's row to the day before.
+    """
+    midnight = dt_util.as_utc(dt_util.start_of_local_day(moment))
+    start = hour_start(midnight)
+    return start if start == midnight else start + timedelta(hours=1)
+
+
+class StatisticsImporter:
+    """Write what the device remembers as external statistics, in bulk.
+
+    The Halo keeps no sample history; it only has lifetime counters, today's
+    totals, yesterday's cell load and the litres left to filter. Those are
+    collected into one row per hour (counters, levels) or per day (daily
+    values) as fresh data arrives, and imported together once the hour is
+    over, so a connectivity gap costs resolution but not the totals. Levels
+    get the mean, min and max of the hour's samples; daily values only
+    their state. Re-importing a row with the same start replaces it, which
+    keeps today's row up to date.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: ChlorinatorDataUpdateCoordinator
+    ) -> None:
+        """Initialise the importer."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._prefix = f"{DOMAIN}:{slugify(coordinator.address)}"
+        self._hour: datetime | None = None
+        # Statistic id -> its metadata and the rows not yet imported, by start
+        self._pending: dict[
+            str, tuple[StatisticMetaData, dict[datetime, StatisticData]]
+        ] = {}
+        # Statistic id -> the level samples of the current hour
+        self._samples: dict[str, list[float]] = {}
+        self._sampled: dict[str, tuple[datetime, str] | None] = {}
+
+    @callback
+    def async_update(self) -> None:
+        """Collect the current values; import the rows of a finished hour."""
+        data = self.coordinator.data
+        if not data or "recorder" not in self.hass.config.components:
+            return
+        now = dt_util.now()
+        hour = hour_start(now)
+        if self._hour is not None and hour != self._hour:
+            self.async_import()
+        self._hour = hour
+        today = day_start(now)
+        yesterday = day_start(now - timedelta(days=1))
+        for key, statistic, name, unit in COUNTER_STATISTICS:
+            self._add(key, statistic, name, unit, hour, has_sum=True)
+        for key, statistic, name, unit in HOURLY_STATISTICS:
+            self._add(key, statistic, name, unit, hour, has_mean=True)
+        for key, statistic, name, unit in TODAY_STATISTICS:
+            self._add(key, statistic, name, unit, today)
+        for key, statistic, name, unit in YESTERDAY_STATISTICS:
+            self._add(key, statistic, name, unit, yesterday)
+
+    def _add(
+        self,
+        key: str,
+        statistic: str,
+        name: str,
+        unit: str | None,
+        start: datetime,
+        has_mean: bool = False,
+        has_sum: bool = False,
+    ) -> None:
+        """Put the current value of key into the statistic's row at start."""
+        if (value := self.coordinator.data.get(key)) is None:
+            return
+        statistic_id = f"{self._prefix}_{statistic}"
+        row: StatisticData = {"start": start, "state": value}
+        if has_sum:
+            row["sum"] = value
+        if has_mean:
+            samples = self._samples.setdefault(statistic_id, [])
+            # Updates that did not read key again add no sample
+            read = self.coordinator.freshness.get(key)
+            if not samples or read != self._sampled.get(statistic_id):
+                samples.append(value)
+                self._sampled[statistic_id] = read
+            row.update(
+                mean=sum(samples) / len(samples), min=min(samples), max=max(samples)
+            )
+        metadata = StatisticMetaData(
+            has_mean=has_mean,
+            has_sum=has_sum,
+            name=f"{self.coordinator.device_info['name']} {name}",
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_of_measurement=unit,
+        )
+        rows = self._pending.setdefault(statistic_id, (metadata, {}))[1]
+        rows[start] = row
+
+    @callback
+    def async_import(self) -> None:
+        """Import every pending row, one call per statistic; also on unload."""
+        pending, self._pending = self._pending, {}
+        self._samples.clear()
+        for statistic_id, (metadata, rows) in pending.items():
+            _LOGGER.debug("Importing %s rows of %s", len(rows), statistic_id)
+            async_add_external_statistics(
+                self.hass, metadata, [rows[start] for start in sorted(rows)]
+            )
@@ -0,0 +1,109 @@
+"""Persist per-chlorinator state across Home Assistant restarts."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from enum import Enum
+import logging
+from typing import Any
+
+from pychlorinator import halo_parsers
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+SECTION_SNAPSHOT = "snapshot"
+SECTION_FRESHNESS = "freshness"
+SECTION_CELL_WEAR = "cell_wear"
+SECTION_DOSING = "dosing"
+SECTION_TURNOVER = "turnover"
+
+
+def encode_value(value: Any) -> Any:
+    """Turn a decoded characteristic value into something JSON can hold."""
+    if isinstance(value, Enum):
+        return {"enum": type(value).__qualname__, "value": value.value}
+    if isinstance(value, (bytes, bytearray)):
+        return {"bytes": bytes(value).hex()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """Reverse encode_value, resolving enums against pychlorinator's parsers."""
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "bytes" in value:
+        return bytes.fromhex(value["bytes"])
+    enum_class: Any = halo_parsers
+    for name in value["enum"].split("."):
+        enum_class = getattr(enum_class, name)
+    return enum_class(value["value"])
+
+
+def encode_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Encode a coordinator data dict."""
+    return {key: encode_value(value) for key, value in data.items()}
+
+
+def decode_data(raw: dict[str, Any]) -> dict[str, Any]:
+    """Decode a stored data dict, dropping values the parsers no longer know."""
+    data = {}
+    for key, value in raw.items():
+        try:
+            data[key] = decode_value(value)
+        except (AttributeError, KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Dropping stored %s: %s", key, err)
+    return data
+
+
+class ChlorinatorStore:
+    """Sectioned store for one config entry.
+
+    Each section is provided by a callable that is evaluated when the store
+    is actually written, so frequent updates only cost a timer reset.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialise the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._sections: dict[str, Any] = {}
+        self._providers: dict[str, Callable[[], Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored sections."""
+        self._sections = await self._store.async_load() or {}
+
+    def get(self, section: str) -> Any:
+        """Return a section as it was last loaded or saved."""
+        return self._sections.get(section)
+
+    @callback
+    def async_set(self, section: str, provider: Callable[[], Any]) -> None:
+        """Save provider() as section on the next (delayed) write."""
+        self._providers[section] = provider
+        self._store.async_delay_save(self._async_data_to_save, STORAGE_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write pending sections now, e.g. before the entry unloads."""
+        if self._providers:
+            await self._store.async_save(self._async_data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored sections."""
+        await self._store.async_remove()
+
+    @callback
+    def _async_data_to_save(self) -> dict[str, Any]:
+        for section, provider in self._providers.items():
+            self._sections[section] = provider()
+        self._providers.clear()
+        return self._sections
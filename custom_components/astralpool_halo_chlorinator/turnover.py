@@ -0,0 +1,89 @@
+"""Filtration progress derived from the litres the Halo has left to filter."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .analytics import RollingWindow
+from .const import FILTER_FLOW_WINDOW, FILTER_HISTORY_DAYS
+from .derived import DerivedValues
+
+
+class TurnoverTracker(DerivedValues):
+    """Follow PoolLeftFilter down to the day's filtration target.
+
+    The flow is the least squares slope of the readings of the last
+    FILTER_FLOW_WINDOW seconds, so it drops to 0 soon after the pump stops.
+    PoolLeftFilter going up means the device started a new target, which
+    clears the window. Litres filtered and the time the target was met are
+    kept per day for the last FILTER_HISTORY_DAYS days.
+    """
+
+    source = "PoolLeftFilter"
+    outputs = dict.fromkeys(
+        (
+            "filter_filtered_today",
+            "filter_target_met",
+            "filter_flow_rate",
+            "filter_time_to_target",
+            "filter_turnover_today",
+        ),
+        "PoolLeftFilter",
+    )
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        """Pick up the stored summaries; the flow starts over."""
+        self.days: dict[str, dict[str, Any]] = dict(stored.get("days", {}))
+        self.flow = RollingWindow(FILTER_FLOW_WINDOW)
+
+    def state(self) -> dict[str, Any]:
+        """Return the summaries to store."""
+        return {"days": self.days}
+
+    def sample(self, read_at: datetime, value: float, data: dict[str, Any]) -> None:
+        """Count what was filtered since the previous reading."""
+        day = self._day(read_at.date())
+        if self.last is not None:
+            last_left = self.last[1]
+            if value < last_left:
+                day["filtered"] += last_left - value
+            elif value > last_left:
+                self.flow = RollingWindow(FILTER_FLOW_WINDOW)
+        if value <= 0 and day["target_met"] is None:
+            day["target_met"] = read_at.isoformat()
+        self.flow.add(read_at.timestamp(), value)
+
+    def derive(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return the filtration progress."""
+        left = self.last[1]
+        today = self._day(dt_util.now().date())
+        derived: dict[str, Any] = {
+            "filter_filtered_today": today["filtered"],
+            "filter_target_met": dt_util.parse_datetime(today["target_met"])
+            if today["target_met"]
+            else None,
+            "filter_flow_rate": None,
+            "filter_time_to_target": 0 if left <= 0 else None,
+        }
+        if isinstance(volume := data.get("PoolVolume"), (int, float)) and volume:
+            derived["filter_turnover_today"] = round(
+                today["filtered"] / volume * 100, 1
+            )
+        if (slope := self.flow.slope) is not None:
+            flow = max(-slope * 60, 0.0)
+            derived["filter_flow_rate"] = round(flow, 1)
+            if left > 0 and flow > 0:
+                derived["filter_time_to_target"] = round(left / flow / 60, 2)
+        return derived
+
+    def _day(self, day: date) -> dict[str, Any]:
+        """Return the summary of a day, forgetting days gone by."""
+        oldest = (day - timedelta(days=FILTER_HISTORY_DAYS - 1)).isoformat()
+        for key in [key for key in self.days if key < oldest]:
+            del self.days[key]
+        return self.days.setdefault(
+            day.isoformat(), {"filtered": 0, "target_met": None}
+        )